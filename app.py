@@ -1,252 +1,189 @@
 import streamlit as st
 from streamlit_gsheets import GSheetsConnection
 import pandas as pd
-from datetime import date, timedelta
-import calendar
-from fpdf import FPDF
+from datetime import date
+import importlib.util
+import io
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from budget import get_default_additional_hours, build_school_calendar, BudgetSummary
+from sheets import WORKSHEETS, SheetWriter, read_sheet, safe_str
+from store import DataStore
+from schedule import build_instructor_schedule, weekday_hours
+from exclusions import ExclusionIndex
+from school_year import DEFAULT_YEAR, YEARS, get_year
+from calendar_view import month_calendar_html
+from scenarios import SCENARIO_COLS, evaluate_scenarios, scenarios_from_table
+from payroll import payroll_rows, write_payroll_csv, write_payroll_xlsx
+import perf
+from perf import PerfRecorder, TimedConnection
+from mirror import SqliteMirror
+from pdfs import cached_monthly_pdf, cached_yearly_calendar_pdf, export_pdf_zip, monthly_pdf_name, PdfJob
 
 # --- 0. 페이지 설정 ---
-st.set_page_config(page_title="2026 강사 통합 관리 시스템", layout="wide")
+st.set_page_config(page_title="강사 통합 관리 시스템", layout="wide")
 
 st.sidebar.info("✅ v23.1 - 추가출근 기본 시수 자동 적용")
 
-# [데이터 연결]
-conn = st.connection("gsheets", type=GSheetsConnection)
-
-# ✅ 수정 1: None을 안전하게 문자열로 변환하는 헬퍼 함수 추가
-def safe_str(val, default="-"):
-    """None, NaN, 빈값을 모두 default로 치환"""
-    if val is None:
-        return default
-    if isinstance(val, float) and pd.isna(val):
-        return default
-    s = str(val).strip()
-    return s if s and s.lower() != "nan" and s.lower() != "none" else default
-
-# ✅ 추가출근일은 원래 요일 시수 대신 사용자가 입력한 시수로 계산
-def get_default_additional_hours(work_date, weekday_hours):
-    weekday_default = int(weekday_hours.get(work_date.weekday(), 0))
-    if weekday_default > 0:
-        return weekday_default
-
-    positive_hours = [int(h) for h in weekday_hours.values() if int(h) > 0]
-    if not positive_hours:
-        return 0
-
-    return max(set(positive_hours), key=lambda h: (positive_hours.count(h), h))
-
-def get_regular_hours(work_date, weekday_hours, added_hours=None):
-    if added_hours and work_date in added_hours:
-        extra_hours = int(added_hours.get(work_date, 0))
-        if extra_hours > 0:
-            return extra_hours
-        return get_default_additional_hours(work_date, weekday_hours)
-    return int(weekday_hours.get(work_date.weekday(), 0))
-
-# [기본 데이터 틀 생성 함수]
-def get_initial_after_df(target_name):
-    months = [f"{m}월" for m in range(3, 13)]
-    return pd.DataFrame({
-        "name": [target_name]*10, "month": months,
-        "w1": [0]*10, "w2": [0]*10, "w3": [0]*10, "w4": [0]*10, "w5": [0]*10, "w6": [0]*10
-    })
+# [성능 측정] 켜 두면 재실행마다 구간별 시간과 캐시 적중을 기록해 사이드바 패널에 보여준다
+def get_perf():
+    if not st.session_state.get('perf_on'):
+        return perf.NULL
+    if 'perf' not in st.session_state:
+        st.session_state.perf = PerfRecorder()
+    return st.session_state.perf
+
+st.sidebar.toggle("⏱ 성능 측정", key="perf_on")
+perf_panel = st.sidebar.container()
+P = get_perf()
+perf.activate(P)
+P.start_run()
+
+# [학년도] 공휴일 · 주 구성 등 달력 구조는 학년도마다 한 번만 만들어 캐시된 것을 쓴다
+YEAR_CHOICES = YEARS
+year = st.sidebar.selectbox("학년도", YEAR_CHOICES, index=YEAR_CHOICES.index(DEFAULT_YEAR), key="year", format_func=lambda y: f"{y}학년도")
+sy = get_year(year)
+
+# [데이터 연결] conn.read / conn.update 시간은 성능 측정에 기록
+conn = TimedConnection(st.connection("gsheets", type=GSheetsConnection))
 
 # [데이터 로드 함수]
+# 정규화된 시트는 모든 세션이 공유하는 캐시에 둔다. TTL(초)은 SHEET_CACHE_TTL 환경변수로 조정
+SHEET_CACHE_TTL = int(os.environ.get("SHEET_CACHE_TTL", "300"))
+
+# 연속 저장은 SHEET_FLUSH_DELAY(초) 동안 모았다가 변경된 행만 한 번에 반영
+SHEET_FLUSH_DELAY = float(os.environ.get("SHEET_FLUSH_DELAY", "1.5"))
+
+# 시트의 로컬 SQLite 사본. 읽기/저장은 로컬에서 하고 SHEET_SYNC_INTERVAL(초)마다 시트와 동기화
+# (SHEET_MIRROR_DB 를 빈 값으로 두면 사본 없이 시트를 직접 읽고 쓴다)
+SHEET_MIRROR_DB = os.environ.get("SHEET_MIRROR_DB", os.path.join(os.path.dirname(os.path.abspath(__file__)), "sheets_mirror.db"))
+SHEET_SYNC_INTERVAL = float(os.environ.get("SHEET_SYNC_INTERVAL", "30"))
+
+@st.cache_resource
+def get_mirror():
+    mirror = SqliteMirror(SHEET_MIRROR_DB, conn, on_change=lambda worksheet: load_sheet.clear(worksheet))
+    mirror.start(SHEET_SYNC_INTERVAL)
+    return mirror
+
+# 사본을 쓸 때도 앱의 읽기/저장 시간이 성능 측정에 남도록 감싼다
+sheet_conn = TimedConnection(get_mirror()) if SHEET_MIRROR_DB else conn
+
+@st.cache_resource
+def get_writer():
+    return SheetWriter(sheet_conn, delay=SHEET_FLUSH_DELAY, on_flush=lambda worksheet: load_sheet.clear(worksheet))
+
+@st.cache_data(ttl=SHEET_CACHE_TTL, show_spinner=False)
+def load_sheet(worksheet):
+    perf.mark_miss()
+    df, layout = read_sheet(sheet_conn, worksheet)
+    get_writer().track(worksheet, df, layout)
+    return df, layout.invalid
+
+def save_sheet(worksheet, data):
+    """변경분 저장 예약. 반영이 끝나면 해당 워크시트 캐시만 비운다"""
+    get_writer().stage(worksheet, data)
+    st.session_state.data_version += 1
+
 def load_all_data():
     try:
-        df_ins = conn.read(worksheet="Instructors", ttl=0)
-        for c in ['rate', 'rate_after', 'mon', 'tue', 'wed', 'thu', 'fri']:
-            if c in df_ins.columns:
-                df_ins[c] = pd.to_numeric(df_ins[c], errors='coerce').fillna(0).astype(int)
-        
-        # ✅ 수정 2: 문자열 컬럼의 None/NaN을 빈 문자열로 치환
-        for c in ['name', 'subject', 'target_classes']:
-            if c in df_ins.columns:
-                df_ins[c] = df_ins[c].fillna('').astype(str).str.strip()
-        # 이름이 빈 행 제거 (GSheets 하단 빈 행 방지)
-        df_ins = df_ins[df_ins['name'] != ''].reset_index(drop=True)
-
-        df_excl = conn.read(worksheet="Exclusions", ttl=0)
-        # ✅ 수정 3: 제외일정의 note None 처리
-        if 'note' in df_excl.columns:
-            df_excl['note'] = df_excl['note'].fillna('').astype(str).str.strip()
-            df_excl['note'] = df_excl['note'].replace({'nan': '', 'None': ''})
-        for c in ['start_date', 'end_date']:
-            if c in df_excl.columns:
-                df_excl[c] = df_excl[c].fillna('').astype(str).str.strip()
-        df_excl = df_excl[df_excl['start_date'] != ''].reset_index(drop=True)
-
-        df_aft = conn.read(worksheet="AfterSchool", ttl=0)
-        for c in ['w1', 'w2', 'w3', 'w4', 'w5', 'w6']:
-            if c not in df_aft.columns:
-                df_aft[c] = 0
-            df_aft[c] = pd.to_numeric(df_aft[c], errors='coerce').fillna(0).astype(int)
-            
-        df_indiv = conn.read(worksheet="Exclusions_Indiv", ttl=0)
-        for c in ['name', 'date', 'type', 'hours', 'note']:
-            if c not in df_indiv.columns:
-                df_indiv[c] = 0 if c == 'hours' else ''
-        # ✅ 수정 4: 개인일정의 note/date None 처리
-        if not df_indiv.empty:
-            df_indiv['note'] = df_indiv['note'].fillna('').astype(str).str.strip()
-            df_indiv['note'] = df_indiv['note'].replace({'nan': '', 'None': ''})
-            for c in ['name', 'type', 'date']:
-                df_indiv[c] = df_indiv[c].fillna('').astype(str).str.strip()
-            df_indiv['hours'] = pd.to_numeric(df_indiv['hours'], errors='coerce').fillna(0).astype(int)
-            df_indiv = df_indiv[df_indiv['date'] != ''].reset_index(drop=True)
-
-        return df_ins, df_excl, df_aft, df_indiv
+        # 4개 워크시트를 동시에 읽어 콜드 스타트를 왕복 1회 수준으로 줄인다
+        ctx = get_script_run_ctx()
+        def _load(worksheet):
+            add_script_run_ctx(threading.current_thread(), ctx)
+            perf.activate(P)
+            with P.cached("시트 캐시"):
+                return load_sheet(worksheet)
+        with ThreadPoolExecutor(max_workers=len(WORKSHEETS)) as ex:
+            loaded = dict(zip(WORKSHEETS, ex.map(_load, WORKSHEETS)))
+        # 날짜를 읽을 수 없어 계산에서 뺀 행 (워크시트별)
+        issues = {ws: bad for ws, (_, bad) in loaded.items() if not bad.empty}
+        return tuple(loaded[ws][0] for ws in WORKSHEETS) + (issues,)
     except Exception as e:
         st.warning(f"데이터 로드 오류: {e}")
-        return pd.DataFrame(), pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
+        return pd.DataFrame(), pd.DataFrame(), pd.DataFrame(), pd.DataFrame(), {}
 
 # 데이터 할당
-if 'ins_df' not in st.session_state:
-    i_raw, e_raw, a_raw, ind_raw = load_all_data()
-    st.session_state.ins_df = i_raw
-    st.session_state.excl_df = e_raw
-    st.session_state.after_df = a_raw
-    st.session_state.excl_indiv_df = ind_raw
-
-HOLIDAYS_DICT = {
-    date(2026,3,1): "삼일절", date(2026,3,2): "대체공휴일", date(2026,5,5): "어린이날", 
-    date(2026,5,24): "부처님오신날", date(2026,5,25): "대체공휴일", date(2026,6,6): "현충일", 
-    date(2026,8,15): "광복절", date(2026,8,17): "대체공휴일", date(2026,9,24): "추석", 
-    date(2026,9,25): "추석", date(2026,9,26): "추석", date(2026,9,28): "대체공휴일",
-    date(2026,10,3): "개천절", date(2026,10,9): "한글날", date(2026,12,25): "성탄절"
-}
-
-# --- 2. PDF 생성 함수 (1: 월별 확인서) ---
-def create_monthly_pdf(target_row, month, worked_dates, h_map, added_hours=None):
-    pdf = FPDF()
-    pdf.add_page()
-    font_path = "font.ttf"
-    if os.path.exists(font_path):
-        pdf.add_font("Nanum", "", font_path)
-        pdf.set_font("Nanum", size=11)
-    else:
-        pdf.set_font("Arial", size=11)
-    
-    pdf.set_font("Nanum", size=18) if os.path.exists(font_path) else pdf.set_font("Arial", size=18)
-    pdf.cell(190, 15, txt=f"2026학년도 {month} 시간강사 수업 현황", ln=True, align='C')
-    pdf.set_font("Nanum", size=11) if os.path.exists(font_path) else pdf.set_font("Arial", size=11)
-    pdf.ln(5)
-    
-    col_w = [40, 150]
-    pdf.cell(col_w[0], 10, "성 명", 1, 0, 'C')
-    # ✅ 수정 5: PDF 출력 시에도 safe_str 적용
-    pdf.cell(col_w[1], 10, f" {safe_str(target_row['name'])}", 1, 1, 'L')
-    pdf.cell(col_w[0], 10, "담당과목", 1, 0, 'C')
-    pdf.cell(col_w[1], 10, f" {safe_str(target_row.get('subject'))}", 1, 1, 'L')
-    pdf.cell(col_w[0], 10, "담당학급", 1, 0, 'C')
-    pdf.cell(col_w[1], 10, f" {safe_str(target_row.get('target_classes'))}", 1, 1, 'L')
-    
-    m_int = int(month.replace('월',''))
-    ld = calendar.monthrange(2026, m_int)[1]
-    pdf.cell(col_w[0], 10, "기 간", 1, 0, 'C')
-    pdf.cell(col_w[1], 10, f" 2026. {str(m_int).zfill(2)}. 01. ~ 2026. {str(m_int).zfill(2)}. {ld}.", 1, 1, 'L')
-    
-    pdf.ln(2)
-    pdf.set_fill_color(240, 240, 240)
-    cols = [15, 40, 25, 30, 40, 40]
-    headers = ["연번", "날짜", "요일", "수업시수", "강사료(원)", "비고"]
-    for i, h in enumerate(headers):
-        pdf.cell(cols[i], 10, h, 1, 0, 'C', fill=True)
-    pdf.ln()
-    
-    rc, th, tp = 0, 0, 0
-    dk = ["월", "화", "수", "목", "금", "토", "일"]
-    for d in sorted(worked_dates):
-        rc += 1
-        h = get_regular_hours(d, h_map, added_hours)
-        p = h * int(target_row['rate'])
-        pdf.cell(cols[0], 8, str(rc), 1, 0, 'C')
-        pdf.cell(cols[1], 8, d.strftime("%m월 %d일"), 1, 0, 'C')
-        pdf.cell(cols[2], 8, dk[d.weekday()], 1, 0, 'C')
-        pdf.cell(cols[3], 8, str(int(h)), 1, 0, 'C')
-        pdf.cell(cols[4], 8, f"{int(p):,}", 1, 0, 'R')
-        pdf.cell(cols[5], 8, "", 1, 1, 'C')
-        th += h
-        tp += p
-    while rc < 12:
-        rc += 1
-        for i in range(6):
-            pdf.cell(cols[i], 8, "", 1, (1 if i==5 else 0), 'C')
-    
-    pdf.set_fill_color(255, 255, 153)
-    pdf.cell(cols[0]+cols[1], 10, "합계", 1, 0, 'C', fill=True)
-    pdf.cell(cols[2], 10, f"{len(worked_dates)}일", 1, 0, 'C', fill=True)
-    pdf.cell(cols[3], 10, f"{int(th)}시간", 1, 0, 'C', fill=True)
-    pdf.cell(cols[4], 10, f"{int(tp):,}원", 1, 0, 'C', fill=True)
-    pdf.cell(cols[5], 10, "", 1, 1, 'C', fill=True)
-    return bytes(pdf.output())
-
-# --- 2-2. PDF 생성 함수 (2: 연간 통합 달력) ---
-def create_yearly_calendar_pdf(target_name, work_dates, tips, ind_adds, hm, cur_aft_df, added_hours=None):
-    pdf = FPDF()
-    pdf.add_page()
-    font_path = "font.ttf"
-    use_nanum = os.path.exists(font_path)
-    if use_nanum:
-        pdf.add_font("Nanum", "", font_path)
-        pdf.set_font("Nanum", size=14)
-    else:
-        pdf.set_font("Arial", size=14)
-
-    pdf.cell(190, 10, txt=f"2026학년도 연간 수업 달력 ({target_name} 선생님)", ln=True, align='C')
-    pdf.ln(5)
-    for m in range(3, 13):
-        if (m-3) % 2 == 0 and m != 3:
-            pdf.add_page()
-        if use_nanum:
-            pdf.set_font("Nanum", size=12)
-        else:
-            pdf.set_font("Arial", size=12)
-        pdf.cell(190, 10, txt=f"■ {m}월 일정", ln=True)
-        if use_nanum:
-            pdf.set_font("Nanum", size=9)
-        else:
-            pdf.set_font("Arial", size=9)
-        cal = calendar.monthcalendar(2026, m)
-        headers = ["월", "화", "수", "목", "금", "토", "일", "정규h", "통합h"]
-        col_w = [20, 20, 20, 20, 20, 20, 20, 25, 25]
-        pdf.set_fill_color(230, 230, 230)
-        for i, h in enumerate(headers): pdf.cell(col_w[i], 8, h, 1, 0, 'C', fill=True)
-        pdf.ln()
-        m_rows = cur_aft_df[cur_aft_df['month'] == f"{m}월"]
-        for w_idx, week in enumerate(cal):
-            reg_h = 0
-            for i in range(7):
-                day = week[i]
-                fill = False
-                if day != 0:
-                    d = date(2026, m, day)
-                    if d in work_dates:
-                        reg_h += get_regular_hours(d, hm, added_hours)
-                        fill = True
-                        if d in ind_adds: pdf.set_fill_color(173, 216, 230)
-                        else: pdf.set_fill_color(144, 238, 144)
-                    elif d in tips:
-                        pdf.set_fill_color(255, 182, 193)
-                        fill = True
-                pdf.cell(col_w[i], 8, str(day) if day != 0 else "", 1, 0, 'C', fill=fill)
-            
-            aft_h = 0
-            if not m_rows.empty:
-                col_name = f'w{w_idx+1}'
-                if col_name in m_rows.columns: aft_h = int(m_rows.iloc[0][col_name])
-            pdf.set_fill_color(245, 245, 245)
-            pdf.cell(col_w[7], 8, f"{reg_h}h", 1, 0, 'C', fill=True)
-            pdf.set_fill_color(238, 246, 255)
-            pdf.cell(col_w[8], 8, f"{reg_h + aft_h}h", 1, 1, 'C', fill=True)
-        pdf.ln(5)
-    return bytes(pdf.output())
+if 'store' not in st.session_state:
+    with P.span("load_all_data"):
+        i_raw, e_raw, a_raw, ind_raw, st.session_state.load_issues = load_all_data()
+    # 강사/방과후/개인일정은 강사 이름으로 묶어 보관 (시트 형태 표는 저장할 때만 다시 만든다)
+    st.session_state.store = DataStore(i_raw, e_raw, a_raw, ind_raw)
+    # 저장할 때마다 올라가는 데이터 버전 (강사별 일정 재계산 기준)
+    st.session_state.data_version = 0
+    st.session_state.schedules = {}
+    st.session_state.budget = {}
+store = st.session_state.store
+
+# [일정 계산 캐시] 데이터 버전이 바뀔 때만 다시 계산
+def get_exclusion_index(sy):
+    """공통 제외일 색인은 학년도/데이터 버전마다 한 번만 만든다"""
+    key = st.session_state.data_version
+    by_year = st.session_state.setdefault('excl_index', {})
+    cached = by_year.get(sy.year)
+    P.count("공통 제외 색인", cached is not None and cached[0] == key)
+    if cached is None or cached[0] != key:
+        with P.span("공통 제외 색인"):
+            cached = (key, ExclusionIndex(sy.holidays, store.excl_df))
+        by_year[sy.year] = cached
+    return cached[1]
+
+def get_schedule(target, hm, sy):
+    """강사 일정은 강사/학년도/데이터 버전마다 한 번만 계산"""
+    key = (target, sy.year, st.session_state.data_version)
+    P.count("강사 일정", key in st.session_state.schedules)
+    if key not in st.session_state.schedules:
+        st.session_state.schedules = {k: v for k, v in st.session_state.schedules.items() if k[2] == key[2]}
+        common_ex = get_exclusion_index(sy)
+        with P.span(f"강사 일정 {target}"):
+            st.session_state.schedules[key] = build_instructor_schedule(target, hm, common_ex, store.indiv_for(target), sy)
+    return st.session_state.schedules[key]
+
+def get_budget_summary(sy):
+    """학년도별 강사 × 월 예산 요약. 처음 한 번만 전체 계산하고, 이후엔 바뀐 강사 / 바뀐 제외 날짜만 반영"""
+    budgets = st.session_state.budget
+    # 바뀐 강사는 불러온 모든 학년도 요약에 쌓아 두었다가 그 학년도를 볼 때 반영
+    changed = store.take_changes()
+    for _, pending in budgets.values():
+        pending |= changed
+    school_cal = build_school_calendar(get_exclusion_index(sy), sy)
+    if sy.year not in budgets:
+        with P.span("예산 요약 (전체)"):
+            budgets[sy.year] = (BudgetSummary(store.ins_df, store.indiv_df, store.after_year_df(sy.year), school_cal), set())
+        return budgets[sy.year][0]
+    summary, pending = budgets[sy.year]
+    with P.span("예산 요약 (부분)"):
+        summary.update_exclusions(school_cal)
+        for name in pending:
+            summary.update_instructor(name, store.instructor_rows(name), store.indiv_for(name), store.after_for(name, sy.year))
+        pending.clear()
+    return summary
+
+def pdf_jobs(names, months, yearly):
+    """일괄 PDF 출력용 강사별 작업"""
+    for name in names:
+        row = store.instructor(name)
+        yield PdfJob(row, get_schedule(name, weekday_hours(row), sy), store.after_for(name, sy.year), months, yearly)
 
 # --- 3. 사이드바 (등록/수정) ---
 with st.sidebar:
+    writer = get_writer()
+    if writer.last_error:
+        st.error(f"시트 저장 실패: {writer.last_error}")
+    if writer.pending and st.button(f"⏳ 저장 대기 {len(writer.pending)}건 지금 반영"):
+        writer.flush()
+        st.rerun()
+    if SHEET_MIRROR_DB:
+        mirror = get_mirror()
+        if mirror.last_error:
+            st.warning(f"구글 시트 동기화 실패 — 로컬 사본으로 계속 동작합니다 ({mirror.last_error})")
+        unsynced = mirror.pending()
+        if unsynced and st.button(f"🔄 시트 반영 대기 {len(unsynced)}건 지금 동기화"):
+            mirror.sync()
+            st.rerun()
     st.header("👤 강사 관리")
-    mode = st.radio("작업", ["등록/수정", "공통제외"])
+    mode = st.radio("작업", ["등록/수정", "공통제외", "PDF 일괄 출력", "정산표 내보내기"])
     if mode == "등록/수정":
         sub = st.selectbox("구분", ["신규 등록", "수정/삭제"])
         if sub == "신규 등록":
@@ -259,13 +196,13 @@ with st.sidebar:
                 m, t, w, th, f = st.number_input("월", 0), st.number_input("화", 0), st.number_input("수", 0), st.number_input("목", 0), st.number_input("금", 0)
                 if st.form_submit_button("저장"):
                     new = pd.DataFrame([{"name":n,"rate":r,"rate_after":ra,"mon":m,"tue":t,"wed":w,"thu":th,"fri":f, "subject":subj, "target_classes":cl}])
-                    st.session_state.ins_df = pd.concat([st.session_state.ins_df, new], ignore_index=True)
-                    conn.update(worksheet="Instructors", data=st.session_state.ins_df)
+                    store.replace_instructors(pd.concat([store.ins_df, new], ignore_index=True))
+                    save_sheet("Instructors", store.ins_df)
                     st.rerun()
         else:
-            if not st.session_state.ins_df.empty:
-                tn = st.selectbox("강사 선택", st.session_state.ins_df['name'].unique())
-                td = st.session_state.ins_df[st.session_state.ins_df['name'] == tn].iloc[0]
+            if not store.ins_df.empty:
+                tn = st.selectbox("강사 선택", store.names)
+                td = store.instructor(tn)
                 with st.form("edit"):
                     esj = st.text_input("과목", safe_str(td.get('subject', '')))
                     ecl = st.text_input("학급", safe_str(td.get('target_classes', '')))
@@ -273,170 +210,165 @@ with st.sidebar:
                     era = st.number_input("방과후", int(td.get('rate_after', 50000)))
                     em, et, ew, eth, ef = st.number_input("월", int(td['mon'])), st.number_input("화", int(td['tue'])), st.number_input("수", int(td['wed'])), st.number_input("목", int(td['thu'])), st.number_input("금", int(td['fri']))
                     if st.form_submit_button("수정 완료"):
-                        st.session_state.ins_df.loc[st.session_state.ins_df['name']==tn, ['rate','rate_after','mon','tue','wed','thu','fri','subject','target_classes']] = [er, era, em, et, ew, eth, ef, esj, ecl]
-                        conn.update(worksheet="Instructors", data=st.session_state.ins_df)
+                        store.update_instructor(tn, ['rate','rate_after','mon','tue','wed','thu','fri','subject','target_classes'], [er, era, em, et, ew, eth, ef, esj, ecl])
+                        save_sheet("Instructors", store.ins_df)
                         st.rerun()
                     if st.form_submit_button("❌ 삭제"):
-                        st.session_state.ins_df = st.session_state.ins_df[st.session_state.ins_df['name']!=tn]
-                        conn.update(worksheet="Instructors", data=st.session_state.ins_df)
+                        store.replace_instructors(store.ins_df[store.ins_df['name']!=tn])
+                        save_sheet("Instructors", store.ins_df)
                         st.rerun()
-    else:
+    elif mode == "공통제외":
         # ✅ 수정 6: 공통제외 사유 입력을 form 안으로 이동 (기존엔 버튼 콜백 밖에 있어서 항상 빈값 저장됨)
         with st.form("excl_form"):
-            ex_r = st.date_input("공통 제외일", (date(2026,7,20), date(2026,8,20)))
+            ex_r = st.date_input("공통 제외일", (date(sy.year,7,20), date(sy.year,8,20)))
             ex_note = st.text_input("사유", "")
             if st.form_submit_button("공통 제외 저장"):
                 if len(ex_r) == 2:
                     new_ex = pd.DataFrame([{
-                        "start_date": ex_r[0].isoformat(),
-                        "end_date": ex_r[1].isoformat(),
+                        "start_date": ex_r[0],
+                        "end_date": ex_r[1],
                         "note": ex_note if ex_note else ""
                     }])
-                    st.session_state.excl_df = pd.concat([st.session_state.excl_df, new_ex], ignore_index=True)
-                    conn.update(worksheet="Exclusions", data=st.session_state.excl_df)
+                    store.excl_df = pd.concat([store.excl_df, new_ex], ignore_index=True)
+                    save_sheet("Exclusions", store.excl_df)
                     st.rerun()
+    elif mode == "PDF 일괄 출력":
+        # 월말 정산용: 선택한 강사 × 월 양식을 ZIP 하나로
+        if not store.ins_df.empty:
+            all_names = store.names
+            with st.form("bulk_pdf"):
+                b_names = st.multiselect("강사", all_names, default=all_names)
+                b_months = st.multiselect("월", sy.months, default=sy.months, format_func=lambda m: f"{m}월")
+                b_yearly = st.checkbox("연간 달력 포함", value=False)
+                b_go = st.form_submit_button("📦 ZIP 생성")
+            if b_go and b_names:
+                with st.spinner("PDF 생성 중..."):
+                    with P.span("PDF 일괄 ZIP"):
+                        zip_buf = export_pdf_zip(pdf_jobs(b_names, sorted(b_months), b_yearly))
+                st.download_button("⬇️ ZIP 다운로드", zip_buf, f"{sy.year}_수업현황_일괄.zip", "application/zip")
+    else:
+        # 재무 시스템용: 전체 강사 × 월 정산표 한 파일 (강사 한 명씩 계산해 바로 기록)
+        if not store.ins_df.empty:
+            with st.form("payroll_export"):
+                p_months = st.multiselect("월", sy.months, default=sy.months, format_func=lambda m: f"{m}월")
+                # XLSX 는 openpyxl 이 있을 때만
+                p_fmt = st.radio("형식", ["XLSX", "CSV"] if importlib.util.find_spec("openpyxl") else ["CSV"], horizontal=True)
+                p_go = st.form_submit_button("📊 정산표 생성")
+            if p_go and p_months:
+                with st.spinner("정산표 생성 중..."), P.span("정산표 내보내기"):
+                    rows = payroll_rows(store, get_exclusion_index(sy), sorted(p_months), sy)
+                    out = io.BytesIO()
+                    if p_fmt == "XLSX":
+                        write_payroll_xlsx(rows, out)
+                    else:
+                        text = io.TextIOWrapper(out, encoding="utf-8-sig", newline="")
+                        write_payroll_csv(rows, text)
+                        text.detach()
+                ext, mime = ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet") if p_fmt == "XLSX" else ("csv", "text/csv")
+                st.download_button("⬇️ 정산표 다운로드", out.getvalue(), f"{sy.year}_강사_정산표.{ext}", mime)
 
 # --- 4. 메인 대시보드 ---
-st.title("👨‍🏫 2026 강사 통합 관리 시스템 Pro")
-all_ex_common = {d for d in HOLIDAYS_DICT}
-for _, ex in st.session_state.excl_df.iterrows():
-    try:
-        s_d = date.fromisoformat(str(ex['start_date']))
-        e_d = date.fromisoformat(str(ex['end_date']))
-        while s_d <= e_d:
-            all_ex_common.add(s_d)
-            s_d += timedelta(days=1)
-    except: continue
+st.title(f"👨‍🏫 {sy.year} 강사 통합 관리 시스템 Pro")
+
+# ✅ 날짜를 읽을 수 없는 행은 조용히 버리지 않고 보여준다 (시트에는 그대로 남아 있음)
+if st.session_state.load_issues:
+    n_bad = sum(len(bad) for bad in st.session_state.load_issues.values())
+    with st.expander(f"⚠️ 날짜를 읽을 수 없어 계산에서 제외된 행 {n_bad}건", expanded=True):
+        st.caption("YYYY-MM-DD 형식으로 시트에서 고쳐 주세요. 표의 번호는 시트의 행 번호입니다.")
+        for ws, bad in st.session_state.load_issues.items():
+            st.markdown(f"**{ws}**")
+            st.dataframe(bad, use_container_width=True)
 
 c_d1, c_d2 = st.columns([0.65, 0.35])
 with c_d1:
     with st.expander("🗓️ 공통 제외 일정 관리 (방학/공휴일)", expanded=True):
-        ed_ex = st.data_editor(st.session_state.excl_df, num_rows="dynamic", use_container_width=True)
+        ed_ex = st.data_editor(store.excl_df, num_rows="dynamic", use_container_width=True)
         if st.button("공통 일정 최종 저장"):
-            st.session_state.excl_df = ed_ex
-            conn.update(worksheet="Exclusions", data=ed_ex)
+            store.excl_df = ed_ex
+            save_sheet("Exclusions", ed_ex)
             st.rerun()
 with c_d2:
-    gt = 0
-    if not st.session_state.ins_df.empty:
-        for _, ins in st.session_state.ins_df.iterrows():
-            ind_ex = set()
-            ind_add_hours = {}
-            if not st.session_state.excl_indiv_df.empty:
-                i_df = st.session_state.excl_indiv_df[st.session_state.excl_indiv_df['name'] == ins['name']]
-                for _, ind in i_df.iterrows():
-                    try:
-                        ind_date = date.fromisoformat(str(ind['date']))
-                    except:
-                        continue
-                    if ind['type'] == '개인휴무':
-                        ind_ex.add(ind_date)
-                    elif ind['type'] == '추가출근':
-                        ind_add_hours[ind_date] = int(ind.get('hours', 0))
-            hm_i = {0:int(ins['mon']), 1:int(ins['tue']), 2:int(ins['wed']), 3:int(ins['thu']), 4:int(ins['fri'])}
-            curr_d = date(2026, 3, 1)
-            while curr_d <= date(2026, 12, 31):
-                if curr_d in ind_add_hours:
-                    gt += get_regular_hours(curr_d, hm_i, ind_add_hours) * int(ins['rate'])
-                elif curr_d.weekday()<5 and curr_d not in all_ex_common and curr_d not in ind_ex:
-                    gt += hm_i.get(curr_d.weekday(), 0) * int(ins['rate'])
-                curr_d += timedelta(days=1)
-            t_aft_sum = st.session_state.after_df[st.session_state.after_df['name']==ins['name']]
-            gt += int(t_aft_sum[['w1','w2','w3','w4','w5','w6']].sum().sum() * ins.get('rate_after', 50000))
-    st.metric("💰 2026년 전체 소요 예산", f"{gt:,}원")
+    with P.span("예산 계산"):
+        summary = get_budget_summary(sy)
+        month_df = summary.table()
+    st.metric(f"💰 {sy.year}년 전체 소요 예산", f"{summary.total():,}원")
+    if not month_df.empty:
+        with st.expander("강사별 예산 내역"):
+            budget_df = month_df.groupby('name', sort=False)[['days', 'reg_hours', 'aft_hours', 'reg_pay', 'aft_pay', 'pay']].sum().reset_index()
+            st.dataframe(budget_df, hide_index=True, use_container_width=True)
+        with st.expander("강사 × 월 예산"):
+            st.dataframe(month_df.pivot_table(index='name', columns='month', values='pay', aggfunc='sum', sort=False),
+                         use_container_width=True)
+            st.download_button("⬇️ 강사 × 월 표 (CSV)", month_df.to_csv(index=False).encode('utf-8-sig'),
+                               f"{sy.year}_강사별_월별_예산.csv", "text/csv")
+    # 다른 학년도와 나란히 비교 (학년도별 요약도 한 번 만든 뒤에는 부분 갱신)
+    compare = st.multiselect("학년도 비교", [y for y in YEAR_CHOICES if y != sy.year], format_func=lambda y: f"{y}학년도")
+    if compare:
+        rows = []
+        for y in [sy.year] + compare:
+            s = get_budget_summary(get_year(y))
+            t = s.table()
+            rows.append({"학년도": y, "출근일": int(t['days'].sum()), "정규h": int(t['reg_hours'].sum()),
+                         "방과후h": int(t['aft_hours'].sum()), "예산": s.total()})
+        st.dataframe(pd.DataFrame(rows), hide_index=True, use_container_width=True)
+
+# --- 4-1. 예산 시나리오 (가정 계산, 시트에는 저장하지 않음) ---
+def default_scenarios(sy):
+    return pd.DataFrame([
+        {"시나리오": "정규 단가 5% 인상", "정규단가%": 5.0, "방과후단가%": 0.0, "요일": "", "시수증감": 0, "추가제외_시작": None, "추가제외_끝": None},
+        {"시나리오": "여름방학 1주 연장", "정규단가%": 0.0, "방과후단가%": 0.0, "요일": "", "시수증감": 0,
+         "추가제외_시작": date(sy.year, 8, 21), "추가제외_끝": date(sy.year, 8, 27)},
+        {"시나리오": "금요일 1시간 감소", "정규단가%": 0.0, "방과후단가%": 0.0, "요일": "금", "시수증감": -1, "추가제외_시작": None, "추가제외_끝": None},
+    ], columns=SCENARIO_COLS)
+
+@st.fragment
+def render_scenarios(sy):
+    """시나리오 표를 고치면 이 영역만 다시 계산한다. 모든 시나리오를 한 번의 행렬 계산으로 평가"""
+    P = get_perf()
+    own_run = not P.in_run
+    if own_run:
+        perf.activate(P)
+        P.start_run("부분")
+    st.caption("요일은 '월,금' 처럼 쉼표로 구분. 시수증감은 그 요일에 수업이 있는 강사에게만 적용됩니다.")
+    table = st.data_editor(
+        default_scenarios(sy), num_rows="dynamic", use_container_width=True, key=f"scenarios_{sy.year}",
+        column_config={"추가제외_시작": st.column_config.DateColumn(), "추가제외_끝": st.column_config.DateColumn()},
+    )
+    scs = scenarios_from_table(table)
+    if scs:
+        with P.span("시나리오 계산"):
+            summary, per = evaluate_scenarios(store.ins_df, store.indiv_df, store.after_year_df(sy.year), store.excl_df, sy, scs)
+        t_sum, t_per = st.tabs(["합계 비교", "강사별 차이"])
+        t_sum.dataframe(summary.rename(columns={
+            'scenario': '시나리오', 'days': '출근일', 'reg_hours': '정규h', 'aft_hours': '방과후h',
+            'pay': '예산', 'delta': '기준 대비', 'delta_pct': '기준 대비(%)'}), hide_index=True, use_container_width=True)
+        diff = per[['name']].join(per[[sc.name for sc in scs]].sub(per['기준'], axis=0))
+        t_per.dataframe(diff, hide_index=True, use_container_width=True)
+    if own_run:
+        P.end_run()
+
+if not store.ins_df.empty:
+    with st.expander("🧪 예산 시나리오 (가정 계산 · 시트에 저장하지 않음)"):
+        render_scenarios(sy)
 
 st.divider()
 
 # --- 5. 상세 리포트 및 달력 ---
-if not st.session_state.ins_df.empty:
-    target = st.selectbox("조회 강사 선택", st.session_state.ins_df['name'].unique())
-    ins_row = st.session_state.ins_df[st.session_state.ins_df['name'] == target].iloc[-1]
-    hm = {0: int(ins_row['mon']), 1: int(ins_row['tue']), 2: int(ins_row['wed']), 3: int(ins_row['thu']), 4: int(ins_row['fri'])}
-    
-    with st.expander(f"📍 {target} 선생님 개인 일정 관리"):
-        ind_cols = st.columns(2)
-        with ind_cols[0]:
-            with st.form(f"ind_{target}"):
-                id_d = st.date_input("날짜")
-                it_t = st.selectbox("구분", ["개인휴무","추가출근"])
-                ih = st.number_input("추가출근 시수", min_value=0, value=get_default_additional_hours(id_d, hm), step=1, help="원래 수업 요일이 아닌 날은 기존 요일별 시수 중 가장 많이 쓰는 시수를 기본값으로 넣습니다. 필요하면 직접 수정하세요.")
-                in_n = st.text_input("사유")
-                if st.form_submit_button("추가"):
-                    new_ind = pd.DataFrame([{"name":target,"date":id_d.isoformat(),"type":it_t,"hours":int(ih) if it_t == "추가출근" else 0,"note":in_n if in_n else ""}])
-                    st.session_state.excl_indiv_df = pd.concat([st.session_state.excl_indiv_df, new_ind], ignore_index=True)
-                    conn.update(worksheet="Exclusions_Indiv", data=st.session_state.excl_indiv_df)
-                    st.rerun()
-        with ind_cols[1]:
-            t_ind_df = st.session_state.excl_indiv_df[st.session_state.excl_indiv_df['name']==target].copy()
-            if 'note' in t_ind_df.columns:
-                t_ind_df['note'] = t_ind_df['note'].fillna('').astype(str).replace({'nan':'','None':''})
-            if 'hours' not in t_ind_df.columns:
-                t_ind_df['hours'] = 0
-            e_ind_df = st.data_editor(t_ind_df[['date','type','hours','note']], num_rows="dynamic", key=f"e_{target}")
-            if st.button("개인 일정 저장"):
-                others_ind = st.session_state.excl_indiv_df[st.session_state.excl_indiv_df['name'] != target]
-                e_ind_df['hours'] = pd.to_numeric(e_ind_df['hours'], errors='coerce').fillna(0).astype(int)
-                e_ind_df['name'] = target
-                st.session_state.excl_indiv_df = pd.concat([others_ind, e_ind_df], ignore_index=True)
-                conn.update(worksheet="Exclusions_Indiv", data=st.session_state.excl_indiv_df)
-                st.rerun()
-
-    cur_aft = st.session_state.after_df[st.session_state.after_df['name']==target].copy().reset_index(drop=True)
-    if cur_aft.empty: cur_aft = get_initial_after_df(target)
-    
-    # ✅ 수정 8: tips 딕셔너리에 None이 절대 들어가지 않도록 safe_str 적용
-    tips = {d: safe_str(label, "공휴일") for d, label in HOLIDAYS_DICT.items()}
-
-    for _, ex in st.session_state.excl_df.iterrows():
-        try:
-            ts_d = date.fromisoformat(str(ex['start_date']))
-            te_d = date.fromisoformat(str(ex['end_date']))
-            note_val = safe_str(ex.get('note'), "제외일")
-            while ts_d <= te_d:
-                tips[ts_d] = note_val
-                ts_d += timedelta(days=1)
-        except: continue
-    
-    # ✅ t_ind_df 재참조 안전하게 처리
-    t_ind_df = st.session_state.excl_indiv_df[st.session_state.excl_indiv_df['name']==target].copy()
-    if 'note' in t_ind_df.columns:
-        t_ind_df['note'] = t_ind_df['note'].fillna('').astype(str).replace({'nan':'','None':''})
-    if 'hours' not in t_ind_df.columns:
-        t_ind_df['hours'] = 0
-    t_ind_df['hours'] = pd.to_numeric(t_ind_df['hours'], errors='coerce').fillna(0).astype(int)
-
-    adds = set()
-    add_hours = {}
-    for _, ex in t_ind_df.iterrows():
-        try:
-            td_d = date.fromisoformat(str(ex['date']))
-            note_val = safe_str(ex.get('note'), '')
-            if ex['type'] == '개인휴무':
-                tips[td_d] = f"[개인] {note_val}".strip()
-            else:
-                adds.add(td_d)
-                add_hours[td_d] = int(ex.get('hours', 0))
-                tips[td_d] = f"[추가] {note_val}".strip()
-        except: continue
-    
-    work_dates = list(filter(
-        lambda d: (d.weekday() < 5 and d not in tips and hm.get(d.weekday(), 0) > 0) or (d in adds),
-        [date(2026,3,1) + timedelta(n) for n in range(306)]
-    ))
-
-    st.subheader(f"📊 {target} 선생님 상세 리포트")
-    try:
-        y_pdf = create_yearly_calendar_pdf(target, work_dates, tips, adds, hm, cur_aft, add_hours)
-        _ = st.download_button("📄 1년치 통합 달력 PDF 출력", y_pdf, f"2026_연간달력_{target}.pdf", "application/pdf")
-    except Exception as e:
-        st.caption(f"연간 달력 PDF 생성 실패: {type(e).__name__}")
-
+@st.fragment
+def render_month_cards(target, ins_row, sched, cur_aft):
+    """월별 카드 + 연간 요약. 방과후 시수 입력을 바꾸면 전체가 아니라 이 영역만 다시 실행된다"""
+    P = get_perf()
+    # 부분 재실행이면 전체 실행과 따로 한 번의 기록으로 남긴다
+    own_run = not P.in_run
+    if own_run:
+        perf.activate(P)
+        P.start_run("부분")
     cols = st.columns(2)
     t_reg_h, t_aft_h, t_att_d = 0, 0, 0
-    for m in range(3, 13):
-        with cols[(m-3)%2]:
+    sy = sched.sy
+    for m in sy.months:
+        with cols[(m-3)%2], P.span(f"월 카드 {m}월"):
             m_l = f"{m}월"
-            cal = calendar.monthcalendar(2026, m)
             st.markdown(f"#### 🗓️ {m_l}")
             r_idx = cur_aft[cur_aft['month'] == m_l].index[0]
             inner_cols = st.columns([0.8, 0.2])
@@ -444,45 +376,22 @@ if not st.session_state.ins_df.empty:
             # 오른쪽 컬럼: 방과후 시수 입력
             inner_cols[1].caption("방과후 시수")
             wa = []
-            for i in range(len(cal)):
-                cn = f'w{i+1}'
+            for i, cn in enumerate(sy.week_cols[m]):
                 val = int(cur_aft.at[r_idx, cn]) if cn in cur_aft.columns else 0
-                wi = inner_cols[1].number_input(f"{m}월{i+1}주", value=val, step=1, key=f"w{i+1}_{target}_{m}")
+                wi = inner_cols[1].number_input(f"{m}월{i+1}주", value=val, step=1, key=f"{cn}_{target}_{sy.year}_{m}")
                 wa.append(wi)
-            cur_aft.loc[r_idx, [f'w{i+1}' for i in range(len(cal))]] = wa
-            mw = sorted([d for d in work_dates if d.month == m])
+            cur_aft.loc[r_idx, sy.week_cols[m]] = wa
             if inner_cols[1].button(f"📄 {m}월 양식 PDF", key=f"btn_{m}"):
-                pdf_m = create_monthly_pdf(ins_row, m_l, mw, hm, add_hours)
-                f_name = f"2026학년도 {m_l} {safe_str(ins_row.get('subject', ''))} 시간강사({target}선생님) 수업 현황.pdf"
+                with P.span("월별 양식 PDF"), P.cached("PDF"):
+                    pdf_m = cached_monthly_pdf(ins_row, m_l, sched)
+                f_name = monthly_pdf_name(ins_row, m_l, sy.year)
                 inner_cols[1].download_button(f"⬇️ 다운로드", pdf_m, f_name, "application/pdf", key=f"dl_{m}")
 
-            # 왼쪽 컬럼: 달력 HTML
-            html = '<table style="width:100%; border-collapse:collapse; text-align:center; font-size:12px;">'
-            html += '<tr style="background:#f0f2f6;"><th>월</th><th>화</th><th>수</th><th>목</th><th>금</th><th>토</th><th>일</th><th style="color:#666;">정규h</th><th style="color:#007bff;">통합h</th></tr>'
-            m_rc = 0
-            for w_idx, week in enumerate(cal):
-                html += '<tr>'
-                wh = 0
-                for i in range(7):
-                    day = week[i]
-                    if day == 0: html += '<td></td>'
-                    else:
-                        d = date(2026, m, day)
-                        cls, t = "", ""
-                        if d in work_dates:
-                            cls = "background:#90EE90; font-weight:bold;"
-                            wh += get_regular_hours(d, hm, add_hours)
-                            m_rc += 1
-                            if d in adds: cls = "background:#add8e6; font-weight:bold;"
-                        elif d in tips:
-                            cls = "background:#FFB6C1; cursor:help;"
-                            tip_text = safe_str(tips.get(d), '')
-                            t = f'title="{tip_text}"' if tip_text else ''
-                        html += f'<td style="border:1px solid #ddd; padding:4px; {cls}" {t}>{day}</td>'
-                html += f'<td style="border:1px solid #ddd; background:#f9f9f9; color:#666;">{int(wh)}</td>'
-                html += f'<td style="border:1px solid #ddd; background:#eef6ff; font-weight:bold; color:#007bff;">{int(wh + wa[w_idx])}</td></tr>'
-            inner_cols[0].markdown(html + '</table>', unsafe_allow_html=True)
-            m_ah, m_rh = sum(wa), sum([get_regular_hours(d, hm, add_hours) for d in mw])
+            # 왼쪽 컬럼: 달력 HTML (그 달 입력이 같으면 캐시된 문자열 재사용)
+            with P.cached("달력 HTML"):
+                cal_html = month_calendar_html(sched, m, wa)
+            inner_cols[0].markdown(cal_html, unsafe_allow_html=True)
+            m_ah, m_rh, m_rc = sum(wa), sched.month_hours[m], sched.month_days[m]
             m_rp, m_ap = m_rh * int(ins_row['rate']), m_ah * int(ins_row.get('rate_after', 50000))
             st.info(f"💰 {m}월 합계: {(m_rp + m_ap):,}원 (출근 {m_rc}일) | 정규 {int(m_rh)}h | 방과후 {int(m_ah)}h")
             t_reg_h += m_rh
@@ -491,9 +400,8 @@ if not st.session_state.ins_df.empty:
 
     st.divider()
     if st.button(f"💾 {target} 강사 시수 데이터 최종 저장"):
-        others_aft = st.session_state.after_df[st.session_state.after_df['name'] != target]
-        st.session_state.after_df = pd.concat([others_aft, cur_aft], ignore_index=True)
-        conn.update(worksheet="AfterSchool", data=st.session_state.after_df)
+        store.replace_after(target, cur_aft, sy.year)
+        save_sheet("AfterSchool", store.after_df)
         st.rerun()
 
     st.subheader("🏁 연간 최종 합계 요약")
@@ -502,3 +410,71 @@ if not st.session_state.ins_df.empty:
     c2.metric("정규 시수", f"{t_reg_h}h")
     c3.metric("방과후 시수", f"{t_aft_h}h")
     c4.metric("급여 합계", f"{int((t_reg_h*ins_row['rate'])+(t_aft_h*ins_row.get('rate_after',50000))):,}원")
+    if own_run:
+        P.end_run()
+
+if not store.ins_df.empty:
+    target = st.selectbox("조회 강사 선택", store.names)
+    ins_row = store.instructor(target)
+    hm = weekday_hours(ins_row)
+    
+    with st.expander(f"📍 {target} 선생님 개인 일정 관리"):
+        ind_cols = st.columns(2)
+        with ind_cols[0]:
+            with st.form(f"ind_{target}"):
+                id_d = st.date_input("날짜")
+                it_t = st.selectbox("구분", ["개인휴무","추가출근"])
+                ih = st.number_input("추가출근 시수", min_value=0, value=get_default_additional_hours(id_d, hm), step=1, help="원래 수업 요일이 아닌 날은 기존 요일별 시수 중 가장 많이 쓰는 시수를 기본값으로 넣습니다. 필요하면 직접 수정하세요.")
+                in_n = st.text_input("사유")
+                if st.form_submit_button("추가"):
+                    new_ind = pd.DataFrame([{"name":target,"date":id_d,"type":it_t,"hours":int(ih) if it_t == "추가출근" else 0,"note":in_n if in_n else ""}])
+                    store.add_indiv(target, new_ind)
+                    save_sheet("Exclusions_Indiv", store.indiv_df)
+                    st.rerun()
+        with ind_cols[1]:
+            t_ind_df = store.indiv_for(target)
+            if 'note' in t_ind_df.columns:
+                t_ind_df['note'] = t_ind_df['note'].fillna('').astype(str).replace({'nan':'','None':''})
+            if 'hours' not in t_ind_df.columns:
+                t_ind_df['hours'] = 0
+            e_ind_df = st.data_editor(t_ind_df[['date','type','hours','note']], num_rows="dynamic", key=f"e_{target}")
+            if st.button("개인 일정 저장"):
+                e_ind_df['hours'] = pd.to_numeric(e_ind_df['hours'], errors='coerce').fillna(0).astype(int)
+                store.replace_indiv(target, e_ind_df)
+                save_sheet("Exclusions_Indiv", store.indiv_df)
+                st.rerun()
+
+    cur_aft = store.after_for(target, sy.year)
+    
+    sched = get_schedule(target, hm, sy)
+
+    st.subheader(f"📊 {target} 선생님 상세 리포트")
+    # 연간 달력 PDF 는 요청할 때만 만든다 (같은 내용이면 캐시 재사용)
+    if st.button("📄 1년치 통합 달력 PDF 출력", key=f"y_pdf_{target}"):
+        try:
+            with P.span("연간 달력 PDF"), P.cached("PDF"):
+                y_pdf = cached_yearly_calendar_pdf(target, sched, cur_aft)
+            st.download_button("⬇️ 연간 달력 다운로드", y_pdf, f"{sy.year}_연간달력_{target}.pdf", "application/pdf", key=f"y_dl_{target}")
+        except Exception as e:
+            st.caption(f"연간 달력 PDF 생성 실패: {type(e).__name__}")
+
+    render_month_cards(target, ins_row, sched, cur_aft)
+
+P.end_run()
+
+# [성능 측정 패널] 이번 실행의 구간별 시간, 최근 실행 백분위, 캐시 적중
+if P.last_run:
+    with perf_panel.expander("⏱ 성능 측정 결과", expanded=True):
+        last = P.last_run
+        st.caption(f"이번 실행 {last['total_ms']:.0f} ms · 기록 {len(P.runs)}회")
+        spans = pd.DataFrame(last['spans'], columns=['구간', 'ms'])
+        st.dataframe(spans.groupby('구간', sort=False)['ms'].agg(['count', 'sum']).round(1), use_container_width=True)
+        st.caption("최근 실행 백분위 (ms)")
+        st.dataframe(pd.DataFrame(P.percentiles()), hide_index=True, use_container_width=True)
+        if P.cache:
+            st.caption("캐시 적중")
+            st.dataframe(pd.DataFrame(P.cache_stats()), hide_index=True, use_container_width=True)
+        if perf.BACKGROUND.runs:
+            st.caption("백그라운드 시트 저장 (ms)")
+            st.dataframe(pd.DataFrame(perf.BACKGROUND.percentiles()), hide_index=True, use_container_width=True)
+        st.download_button("⬇️ JSON 내보내기", P.to_json(), "perf.json", "application/json")
@@ -0,0 +1,158 @@
+"""성능 측정 스크립트. 결과는 JSON 으로 출력한다.
+
+    python bench.py pdf --docs 30
+    python bench.py suite --sizes 10 100 1000 > before.json
+
+suite 는 가상의 학년도 데이터(강사 수별, 개인휴무/추가출근 이력 포함)로 주요 구간을 따로 잰다.
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+import pandas as pd
+
+import pdfs
+from budget import BudgetSummary, build_school_calendar
+from calendar_view import _month_html, month_calendar_html
+from exclusions import ExclusionIndex
+from schedule import build_instructor_schedule, weekday_hours
+from school_year import get_year
+from sheets import WORKSHEETS, LocalSheetConnection, get_initial_after_df, read_sheet
+from store import DataStore
+
+def _sample_instructor():
+    row = pd.Series({"name": "홍길동", "subject": "통합과학", "target_classes": "1학년 1반 ~ 8반",
+                     "rate": 25000, "rate_after": 50000, "mon": 2, "tue": 0, "wed": 3, "thu": 0, "fri": 2})
+    indiv = pd.DataFrame(columns=["name", "date", "type", "hours", "note"])
+    sched = build_instructor_schedule(row['name'], weekday_hours(row), ExclusionIndex({}), indiv)
+    return row, sched, get_initial_after_df(row['name'])
+
+def _timed(fn, n):
+    sizes = []
+    t = time.perf_counter()
+    for _ in range(n):
+        sizes.append(len(fn()))
+    return {"docs": n, "sec_per_doc": (time.perf_counter() - t) / n, "avg_bytes": sum(sizes) // n}
+
+def bench_pdf(docs=30):
+    """원본 폰트를 매번 읽는 방식(full_font)과 서브셋 폰트 캐시(subset_font) 비교"""
+    row, sched, aft = _sample_instructor()
+    results = {}
+    font_file = pdfs.font_file
+    for mode, fn in [("full_font", lambda *texts: pdfs.FONT_PATH), ("subset_font", font_file)]:
+        pdfs.font_file = fn
+        try:
+            fn(row['name'])  # 서브셋 생성은 프로세스당 한 번이므로 측정에서 제외
+            results[mode] = {
+                "monthly": _timed(lambda: pdfs.create_monthly_pdf(row, "3월", sched), docs),
+                "yearly": _timed(lambda: pdfs.create_yearly_calendar_pdf(row['name'], sched, aft), max(1, docs // 5)),
+            }
+        finally:
+            pdfs.font_file = font_file
+    return results
+
+def synthetic_sheets(n, seed=0, indiv_per_instructor=40):
+    """시트에서 읽은 것과 같은 (문자열 날짜) 형태의 가상 데이터 4종"""
+    rnd = random.Random(seed)
+    ins = pd.DataFrame([{
+        "name": f"강사{i:04d}", "rate": rnd.choice([25000, 30000]), "rate_after": rnd.choice([40000, 50000]),
+        **{c: rnd.choice([0, 0, 1, 2, 3, 4]) for c in ['mon', 'tue', 'wed', 'thu', 'fri']},
+        "subject": rnd.choice(["통합과학", "국어", "수학"]), "target_classes": "1학년 1반 ~ 8반",
+    } for i in range(n)])
+    excl = pd.DataFrame([
+        {"start_date": "2026-07-20", "end_date": "2026-08-20", "note": "여름방학"},
+        {"start_date": "2026-04-27", "end_date": "2026-04-30", "note": "중간고사"},
+        {"start_date": "2026-06-29", "end_date": "2026-07-02", "note": "기말고사"},
+        {"start_date": "2026-10-12", "end_date": "2026-10-15", "note": "중간고사"},
+    ])
+    aft = pd.DataFrame([
+        {"name": name, "month": f"{m}월", **{f"w{k}": rnd.choice([0, 0, 1, 2]) for k in range(1, 7)}}
+        for name in ins['name'] for m in range(3, 13)
+    ])
+    indiv = pd.DataFrame([{
+        "name": name, "date": (date(2026, 3, 1) + timedelta(rnd.randrange(306))).isoformat(),
+        "type": rnd.choice(["개인휴무", "추가출근"]), "hours": rnd.choice([0, 0, 2, 3]), "note": "",
+    } for name in ins['name'] for _ in range(indiv_per_instructor)])
+    return dict(zip(WORKSHEETS, [ins, excl, aft, indiv]))
+
+def _span(fn, repeat=3):
+    """fn 을 repeat 번 실행한 최소/중앙 시간(초)과 마지막 결과"""
+    times, out = [], None
+    for _ in range(repeat):
+        t = time.perf_counter()
+        out = fn()
+        times.append(time.perf_counter() - t)
+    times.sort()
+    return {"min_sec": times[0], "median_sec": times[len(times) // 2]}, out
+
+def bench_size(n, docs=5, repeat=3):
+    """강사 n 명 데이터로 구간별 시간 측정"""
+    conn = LocalSheetConnection(synthetic_sheets(n))
+    res = {}
+    res["load_normalize"], frames = _span(lambda: {ws: read_sheet(conn, ws)[0] for ws in WORKSHEETS}, repeat)
+    store = DataStore(*(frames[ws] for ws in WORKSHEETS))
+    sy = get_year(2026)
+    res["exclusion_index"], common_ex = _span(lambda: ExclusionIndex(sy.holidays, store.excl_df), repeat)
+    school_cal = build_school_calendar(common_ex, sy)
+    # 화면과 같은 경로: 처음 한 번 전체 요약, 이후엔 강사 한 명 / 바뀐 제외 날짜만 반영
+    res["budget_summary"], summary = _span(
+        lambda: BudgetSummary(store.ins_df, store.indiv_df, store.after_year_df(sy.year), school_cal), repeat)
+    name = store.names[0]
+    res["budget_update_instructor"], _ = _span(lambda: summary.update_instructor(
+        name, store.instructor_rows(name), store.indiv_for(name), store.after_for(name, sy.year)), repeat)
+    # 일주일 제외 기간을 넣었다 뺐다 하며 매번 바뀐 날짜가 있게 한다
+    week = pd.DataFrame([{"start_date": date(2026, 5, 11), "end_date": date(2026, 5, 15), "note": "bench"}])
+    cals = [build_school_calendar(ExclusionIndex(sy.holidays, pd.concat([store.excl_df, week], ignore_index=True)), sy), school_cal]
+    flips = iter(range(repeat))
+    res["budget_update_exclusions"], _ = _span(lambda: summary.update_exclusions(cals[next(flips) % 2]), repeat)
+
+    def schedules():
+        return {name: build_instructor_schedule(name, weekday_hours(store.instructor(name)), common_ex, store.indiv_for(name), sy)
+                for name in store.names}
+    res["schedules"], scheds = _span(schedules, repeat)
+    res["schedules"]["per_instructor_sec"] = res["schedules"]["median_sec"] / n
+
+    # 달력 HTML 캐시는 화면에서 오가는 강사 수 정도(약 100명 × 10개월)를 담는 크기라 그 범위만 잰다
+    wa = [1, 0, 2, 0, 1, 0]
+    cal_scheds = list(scheds.values())[:100]
+    def calendars():
+        return [month_calendar_html(s, m, wa) for s in cal_scheds for m in sy.months]
+    _month_html.cache_clear()
+    res["calendar_html_cold"], _ = _span(lambda: (_month_html.cache_clear(), calendars()), repeat)
+    res["calendar_html_warm"], _ = _span(calendars, repeat)
+
+    # PDF 는 강사 수와 무관하게 문서 단위 비용이므로 앞쪽 docs 명만 측정
+    names = store.names[:docs]
+    pdfs.font_file(*names)
+    res["monthly_pdf"], _ = _span(lambda: [pdfs.create_monthly_pdf(store.instructor(nm), "3월", scheds[nm]) for nm in names], 1)
+    res["yearly_pdf"], _ = _span(lambda: [pdfs.create_yearly_calendar_pdf(nm, scheds[nm], store.after_for(nm)) for nm in names], 1)
+    for k in ("monthly_pdf", "yearly_pdf"):
+        res[k]["per_doc_sec"] = res[k]["median_sec"] / max(len(names), 1)
+    return {"instructors": n, "indiv_rows": len(store.indiv_df), "spans": res}
+
+def bench_suite(docs=5, sizes=(10, 100, 1000), repeat=3):
+    """강사 수별 주요 구간 시간"""
+    return [bench_size(n, docs, repeat) for n in sizes]
+
+BENCHES = {"pdf": bench_pdf, "suite": bench_suite}
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="강사 시수 프로그램 성능 측정")
+    p.add_argument("bench", choices=sorted(BENCHES))
+    p.add_argument("--docs", type=int, default=None, help="PDF 측정 문서 수 (pdf 기본 30, suite 기본 5)")
+    p.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000], help="suite 강사 수")
+    p.add_argument("--repeat", type=int, default=3, help="suite 구간별 반복 횟수")
+    args = p.parse_args(argv)
+    if args.bench == "suite":
+        results = bench_suite(args.docs or 5, args.sizes, args.repeat)
+    else:
+        results = BENCHES[args.bench](args.docs or 30)
+    out = {"bench": args.bench, "date": date.today().isoformat(), "results": results}
+    json.dump(out, sys.stdout, ensure_ascii=False, indent=2)
+    print()
+
+if __name__ == "__main__":
+    main()
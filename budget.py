@@ -0,0 +1,232 @@
+import numpy as np
+import pandas as pd
+
+from school_year import get_year
+
+# 요일 컬럼 (월~금). 토/일은 항상 0시간
+WEEKDAY_COLS = ['mon', 'tue', 'wed', 'thu', 'fri']
+AFTER_COLS = ['w1', 'w2', 'w3', 'w4', 'w5', 'w6']
+
+# ✅ 추가출근일은 원래 요일 시수 대신 사용자가 입력한 시수로 계산
+def get_default_additional_hours(work_date, weekday_hours):
+    weekday_default = int(weekday_hours.get(work_date.weekday(), 0))
+    if weekday_default > 0:
+        return weekday_default
+
+    positive_hours = [int(h) for h in weekday_hours.values() if int(h) > 0]
+    if not positive_hours:
+        return 0
+
+    return max(set(positive_hours), key=lambda h: (positive_hours.count(h), h))
+
+def get_regular_hours(work_date, weekday_hours, added_hours=None):
+    if added_hours and work_date in added_hours:
+        extra_hours = int(added_hours.get(work_date, 0))
+        if extra_hours > 0:
+            return extra_hours
+        return get_default_additional_hours(work_date, weekday_hours)
+    return int(weekday_hours.get(work_date.weekday(), 0))
+
+# [학사 달력] 날짜 / 요일 / 공통 제외 여부를 한 번만 만든다 (common_ex: ExclusionIndex, sy: SchoolYear)
+def build_school_calendar(common_ex, sy=None):
+    sy = sy or get_year()
+    return pd.DataFrame({
+        'date': sy.dates,
+        'weekday': sy.weekday,
+        'excluded': common_ex.mask(sy.dates),
+    })
+
+def _weekday_matrix(ins_df):
+    """강사 × 요일(0~6) 시수 행렬"""
+    hm = np.zeros((len(ins_df), 7), dtype=np.int64)
+    for i, c in enumerate(WEEKDAY_COLS):
+        if c in ins_df.columns:
+            hm[:, i] = pd.to_numeric(ins_df[c], errors='coerce').fillna(0).astype(int).to_numpy()
+    return hm
+
+def _mode_hours(hm):
+    """get_default_additional_hours 의 '가장 많이 쓰는 시수' (동률이면 큰 값)"""
+    wk = hm[:, :5]
+    counts = (wk[:, :, None] == wk[:, None, :]).sum(axis=2)
+    # (횟수, 시수) 순으로 가장 큰 양수 시수. 양수가 없으면 0
+    key = np.where(wk > 0, counts * (wk.max(initial=0) + 1) + wk, -1)
+    best = wk[np.arange(len(wk)), key.argmax(axis=1)] if len(wk) else np.zeros(0, dtype=np.int64)
+    return np.where(key.max(axis=1, initial=-1) >= 0, best, 0)
+
+def _indiv_rows(ins_df, indiv_df, school_cal):
+    """개인일정 행을 (강사 행 번호, 달력 열 번호)로 매핑 (date 컬럼은 읽을 때 이미 date 로 변환됨)"""
+    empty = pd.DataFrame(columns=['row', 'col', 'type', 'hours'])
+    if indiv_df is None or indiv_df.empty or not {'name', 'date', 'type'} <= set(indiv_df.columns):
+        return empty
+    day_pos = {d: j for j, d in enumerate(school_cal['date'])}
+    ind = indiv_df[['name', 'date', 'type']].copy()
+    ind['hours'] = pd.to_numeric(indiv_df['hours'], errors='coerce').fillna(0).astype(int) if 'hours' in indiv_df.columns else 0
+    ind['col'] = ind['date'].map(day_pos).fillna(-1).astype(int)
+    ind = ind[ind['col'] >= 0]
+    owners = pd.DataFrame({'name': ins_df['name'].to_numpy(), 'row': np.arange(len(ins_df))})
+    # 원본 행 순서를 유지해야 같은 날짜의 마지막 추가출근 시수가 적용된다
+    ind = ind.reset_index(drop=True).reset_index().merge(owners, on='name').sort_values(['row', 'index'])
+    return ind[['row', 'col', 'type', 'hours']]
+
+def hours_components(ins_df, indiv_df, school_cal, ind=None):
+    """강사 × 날짜 (요일 시수, 개인휴무 여부, 추가출근 시수(-1 = 없음)). 공통 제외는 combine_hours 에서 적용.
+    ind: 같은 강사 표로 이미 만든 _indiv_rows 결과 (강사 행 순서가 같으면 재사용)"""
+    hm = _weekday_matrix(ins_df)
+    wd = school_cal['weekday'].to_numpy()
+    base = hm[:, wd] * (wd < 5)
+    off = np.zeros(base.shape, dtype=bool)
+    addv = np.full(base.shape, -1, dtype=np.int64)
+
+    if ind is None:
+        ind = _indiv_rows(ins_df, indiv_df, school_cal)
+    off_rows = ind[ind['type'] == '개인휴무']
+    off[off_rows['row'].to_numpy(dtype=int), off_rows['col'].to_numpy(dtype=int)] = True
+
+    # 추가출근은 공통/개인 제외보다 우선. 같은 날짜가 여러 번이면 마지막 행 기준
+    add = ind[ind['type'] == '추가출근'].drop_duplicates(['row', 'col'], keep='last')
+    if not add.empty:
+        r = add['row'].to_numpy(dtype=int)
+        c = add['col'].to_numpy(dtype=int)
+        extra = add['hours'].to_numpy(dtype=np.int64)
+        day_h = hm[r, wd[c]]
+        default = np.where(day_h > 0, day_h, _mode_hours(hm)[r])
+        addv[r, c] = np.where(extra > 0, extra, default)
+    return base, off, addv
+
+def combine_hours(base, off, addv, excluded):
+    """(정규 시수, 출근 여부) — 추가출근 > 공통/개인 제외 > 요일 시수"""
+    regular = base * (~excluded & ~off)
+    is_add = addv >= 0
+    return np.where(is_add, addv, regular), is_add | (regular > 0)
+
+def build_hours_matrix(ins_df, indiv_df, school_cal):
+    """강사 × 날짜 정규 시수 행렬 (get_regular_hours 와 동일한 규칙)"""
+    base, off, addv = hours_components(ins_df, indiv_df, school_cal)
+    return combine_hours(base, off, addv, school_cal['excluded'].to_numpy())[0]
+
+def compute_budget(ins_df, indiv_df, after_df, school_cal):
+    """연간 소요 예산 총액과 강사별 내역을 한 번에 계산"""
+    cols = ['name', 'reg_hours', 'aft_hours', 'reg_pay', 'aft_pay', 'pay']
+    if ins_df is None or ins_df.empty:
+        return 0, pd.DataFrame(columns=cols)
+
+    reg_h = build_hours_matrix(ins_df, indiv_df, school_cal).sum(axis=1)
+    rate = pd.to_numeric(ins_df['rate'], errors='coerce').fillna(0).astype(int).to_numpy()
+    if 'rate_after' in ins_df.columns:
+        rate_after = ins_df['rate_after'].to_numpy()
+    else:
+        rate_after = np.full(len(ins_df), 50000)
+
+    aft_h = np.zeros(len(ins_df), dtype=np.int64)
+    if after_df is not None and not after_df.empty and 'name' in after_df.columns:
+        w_cols = [c for c in AFTER_COLS if c in after_df.columns]
+        per_name = after_df.groupby('name')[w_cols].sum().sum(axis=1)
+        aft_h = ins_df['name'].map(per_name).fillna(0).astype(int).to_numpy()
+
+    reg_pay = reg_h * rate
+    aft_pay = np.array([int(h * r) for h, r in zip(aft_h, rate_after)], dtype=np.int64)
+    breakdown = pd.DataFrame({
+        'name': ins_df['name'].to_numpy(),
+        'reg_hours': reg_h, 'aft_hours': aft_h,
+        'reg_pay': reg_pay, 'aft_pay': aft_pay,
+        'pay': reg_pay + aft_pay,
+    })
+    return int(breakdown['pay'].sum()), breakdown
+
+def _after_by_month(after_df, names, months):
+    """강사 행 × 월 방과후 시수 ('3월' 형식의 month 컬럼 기준)"""
+    out = np.zeros((len(names), len(months)), dtype=np.int64)
+    if after_df is None or after_df.empty or not {'name', 'month'} <= set(after_df.columns):
+        return out
+    w_cols = [c for c in AFTER_COLS if c in after_df.columns]
+    per = after_df.groupby(['name', 'month'])[w_cols].sum().sum(axis=1)
+    col = {f"{m}월": j for j, m in enumerate(months)}
+    row = {}
+    for i, n in enumerate(names):
+        row.setdefault(n, []).append(i)
+    for (n, m), h in per.items():
+        if n in row and m in col:
+            out[row[n], col[m]] = int(h)
+    return out
+
+class BudgetSummary:
+    """강사 × 월 예산 요약 (출근일, 정규/방과후 시수, 급여).
+
+    강사별 날짜 성분(요일 시수 / 개인휴무 / 추가출근)을 들고 있어서, 한 강사의 데이터가 바뀌면
+    그 강사 행만, 공통 제외가 바뀌면 바뀐 날짜 열만 다시 계산해 월 합계에 반영한다."""
+
+    def __init__(self, ins_df, indiv_df, after_df, school_cal):
+        self.dates = list(school_cal['date'])
+        self.excluded = school_cal['excluded'].to_numpy().copy()
+        day_month = np.array([d.month for d in self.dates])
+        self.months = sorted(set(day_month.tolist()))
+        self._day_month = np.searchsorted(self.months, day_month)
+        self._school_cal = school_cal
+        self._set_rows(ins_df, indiv_df, after_df)
+
+    def _rows(self, ins_df, indiv_df, after_df):
+        names = ins_df['name'].to_numpy() if 'name' in ins_df.columns else np.array([], dtype=object)
+        base, off, addv = hours_components(ins_df, indiv_df, self._school_cal)
+        hours, worked = combine_hours(base, off, addv, self.excluded)
+        rate = pd.to_numeric(ins_df['rate'], errors='coerce').fillna(0).astype(int).to_numpy() if 'rate' in ins_df.columns else np.zeros(len(names), dtype=np.int64)
+        rate_after = (pd.to_numeric(ins_df['rate_after'], errors='coerce').fillna(0).astype(int).to_numpy()
+                      if 'rate_after' in ins_df.columns else np.full(len(names), 50000))
+        # pandas 에서 받은 배열은 읽기 전용일 수 있어 복사해 둔다
+        return {k: np.array(v) for k, v in {
+            'names': names, 'rate': rate, 'rate_after': rate_after,
+            'base': base, 'off': off, 'addv': addv, 'hours': hours, 'worked': worked,
+            'm_hours': self._by_month(hours), 'm_days': self._by_month(worked.astype(np.int64)),
+            'm_after': _after_by_month(after_df, list(names), self.months),
+        }.items()}
+
+    def _by_month(self, day_values):
+        out = np.zeros((len(day_values), len(self.months)), dtype=np.int64)
+        np.add.at(out.T, self._day_month, day_values.T)
+        return out
+
+    def _set_rows(self, ins_df, indiv_df, after_df):
+        self.r = self._rows(ins_df, indiv_df, after_df)
+
+    def update_instructor(self, name, ins_rows, indiv_df, after_df):
+        """이름이 name 인 강사 행만 다시 계산 (행 추가/삭제 포함)"""
+        new = self._rows(ins_rows, indiv_df, after_df)
+        pos = np.flatnonzero(self.r['names'] == name)
+        if len(pos) == len(new['names']):
+            for k, v in new.items():
+                self.r[k][pos] = v
+            return
+        at = pos[0] if len(pos) else len(self.r['names'])
+        for k, v in new.items():
+            self.r[k] = np.insert(np.delete(self.r[k], pos, axis=0), at, v, axis=0)
+
+    def update_exclusions(self, school_cal):
+        """공통 제외가 바뀐 날짜 열만 다시 계산. 바뀐 날짜 수 반환"""
+        excluded = school_cal['excluded'].to_numpy()
+        cols = np.flatnonzero(excluded != self.excluded)
+        self.excluded = excluded.copy()
+        self._school_cal = school_cal
+        if len(cols) == 0 or len(self.r['names']) == 0:
+            return len(cols)
+        r = self.r
+        hours, worked = combine_hours(r['base'][:, cols], r['off'][:, cols], r['addv'][:, cols], excluded[cols])
+        d_hours = hours - r['hours'][:, cols]
+        d_days = worked.astype(np.int64) - r['worked'][:, cols]
+        r['hours'][:, cols], r['worked'][:, cols] = hours, worked
+        np.add.at(r['m_hours'].T, self._day_month[cols], d_hours.T)
+        np.add.at(r['m_days'].T, self._day_month[cols], d_days.T)
+        return len(cols)
+
+    def table(self):
+        """강사 × 월 표 (name, month, days, reg_hours, aft_hours, reg_pay, aft_pay, pay)"""
+        r, n, m = self.r, len(self.r['names']), len(self.months)
+        reg_pay = r['m_hours'] * r['rate'][:, None]
+        aft_pay = r['m_after'] * r['rate_after'][:, None]
+        return pd.DataFrame({
+            'name': np.repeat(r['names'], m), 'month': np.tile(self.months, n),
+            'days': r['m_days'].ravel(), 'reg_hours': r['m_hours'].ravel(), 'aft_hours': r['m_after'].ravel(),
+            'reg_pay': reg_pay.ravel(), 'aft_pay': aft_pay.ravel(), 'pay': (reg_pay + aft_pay).ravel(),
+        })
+
+    def total(self):
+        r = self.r
+        return int((r['m_hours'] * r['rate'][:, None]).sum() + (r['m_after'] * r['rate_after'][:, None]).sum())
@@ -0,0 +1,42 @@
+from functools import lru_cache
+
+import perf
+from schedule import WORK, ADD, OFF
+from school_year import get_year
+from sheets import safe_str
+
+CAL_TABLE_OPEN = '<table style="width:100%; border-collapse:collapse; text-align:center; font-size:12px;">'
+CAL_HEADER = '<tr style="background:#f0f2f6;"><th>월</th><th>화</th><th>수</th><th>목</th><th>금</th><th>토</th><th>일</th><th style="color:#666;">정규h</th><th style="color:#007bff;">통합h</th></tr>'
+CELL_STYLE = {
+    WORK: "background:#90EE90; font-weight:bold;",
+    ADD: "background:#add8e6; font-weight:bold;",
+    OFF: "background:#FFB6C1; cursor:help;",
+}
+
+def _day_cell(day, status, tip):
+    if day == 0:
+        return '<td></td>'
+    t = ""
+    if status == OFF:
+        tip_text = safe_str(tip, '')
+        t = f'title="{tip_text}"' if tip_text else ''
+    return f'<td style="border:1px solid #ddd; padding:4px; {CELL_STYLE.get(status, "")}" {t}>{day}</td>'
+
+@lru_cache(maxsize=1024)
+def _month_html(year, month, cells, week_hours, wa):
+    perf.mark_miss()
+    parts = [CAL_TABLE_OPEN, CAL_HEADER]
+    for w_idx, week in enumerate(get_year(year).month_weeks[month]):
+        parts.append('<tr>')
+        parts.extend(_day_cell(day, *(cells[day - 1] if day else ("", ""))) for day in week)
+        wh = week_hours[w_idx]
+        parts.append(f'<td style="border:1px solid #ddd; background:#f9f9f9; color:#666;">{int(wh)}</td>')
+        parts.append(f'<td style="border:1px solid #ddd; background:#eef6ff; font-weight:bold; color:#007bff;">{int(wh + wa[w_idx])}</td></tr>')
+    parts.append('</table>')
+    return ''.join(parts)
+
+def month_calendar_html(sched, month, wa):
+    """월별 카드의 달력 표 HTML.
+    그 달의 (상태, 툴팁) · 주별 정규 시수 · 주별 방과후 시수가 같으면 이전에 만든 문자열을 재사용"""
+    return _month_html(sched.sy.year, month, sched.month_cells(month),
+                       tuple(sched.week_hours[month]), tuple(int(w) for w in wa))
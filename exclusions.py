@@ -0,0 +1,83 @@
+import calendar
+import heapq
+from bisect import bisect_right
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from sheets import safe_str
+
+class ExclusionIndex:
+    """공통 제외일(공휴일 + Exclusions 시트 기간) 색인.
+
+    기간은 한 번만 파싱해서 겹치지 않는 구간 배열로 만든다. 겹치는 기간은 시트의 뒤쪽 행 사유가
+    우선이고(기존 tips 와 동일), 공휴일은 가장 앞 순위로 취급한다."""
+
+    def __init__(self, holidays, excl_df=None):
+        ranges = [(d.toordinal(), d.toordinal(), safe_str(label, "공휴일")) for d, label in holidays.items()]
+        if excl_df is not None and not excl_df.empty:
+            notes = excl_df['note'] if 'note' in excl_df.columns else [None] * len(excl_df)
+            for s_d, e_d, note in zip(excl_df['start_date'], excl_df['end_date'], notes):
+                # 날짜 컬럼은 읽을 때 date 로 변환돼 있다. 편집 중 비워 둔 행만 건너뛴다
+                if pd.isna(s_d) or pd.isna(e_d):
+                    continue
+                if s_d <= e_d:
+                    ranges.append((s_d.toordinal(), e_d.toordinal(), safe_str(note, "제외일")))
+
+        # 경계점을 차례로 훑으며 지금 덮고 있는 기간 중 가장 뒤 순위(목록의 뒤쪽)의 사유를 붙이고,
+        # 같은 사유의 인접 구간은 합친다. 끝난 기간은 힙 맨 위에 올라올 때 버린다
+        order = sorted(range(len(ranges)), key=lambda k: ranges[k][0])
+        bounds = sorted({s for s, _, _ in ranges} | {e + 1 for _, e, _ in ranges})
+        active, segs, nxt = [], [], 0
+        for lo, hi in zip(bounds, bounds[1:]):
+            while nxt < len(order) and ranges[order[nxt]][0] == lo:
+                k = order[nxt]
+                heapq.heappush(active, (-k, ranges[k][1]))
+                nxt += 1
+            while active and active[0][1] < lo:
+                heapq.heappop(active)
+            if not active:
+                continue
+            label = ranges[-active[0][0]][2]
+            if segs and segs[-1][1] == lo - 1 and segs[-1][2] == label:
+                segs[-1][1] = hi - 1
+            else:
+                segs.append([lo, hi - 1, label])
+        self.starts = np.array([s for s, _, _ in segs], dtype=np.int64)
+        self.ends = np.array([e for _, e, _ in segs], dtype=np.int64)
+        self.labels = [lb for _, _, lb in segs]
+        self._starts = self.starts.tolist()
+
+    def _seg(self, d):
+        o = d.toordinal()
+        k = bisect_right(self._starts, o) - 1
+        return k if k >= 0 and o <= self.ends[k] else None
+
+    def __contains__(self, d):
+        return self._seg(d) is not None
+
+    def label(self, d, default=None):
+        """제외 사유 (제외일이 아니면 default)"""
+        k = self._seg(d)
+        return self.labels[k] if k is not None else default
+
+    def mask(self, dates):
+        """날짜 목록 → 제외 여부 bool 배열"""
+        o = np.array([d.toordinal() for d in dates], dtype=np.int64)
+        k = np.searchsorted(self.starts, o, side='right') - 1
+        ok = k >= 0
+        ok[ok] = o[ok] <= self.ends[k[ok]]
+        return ok
+
+    def month_dates(self, year, month):
+        """해당 월의 제외일 목록"""
+        first = date(year, month, 1).toordinal()
+        last = first + calendar.monthrange(year, month)[1] - 1
+        lo = max(bisect_right(self._starts, first) - 1, 0)
+        out = []
+        for s, e in zip(self._starts[lo:], self.ends[lo:].tolist()):
+            if s > last:
+                break
+            out.extend(date.fromordinal(o) for o in range(max(s, first), min(e, last) + 1))
+        return out
@@ -0,0 +1,172 @@
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+from sheets import DATE_COLUMNS, WORKSHEETS, SheetLayout, SheetWriter, to_rows
+
+def _as_text(df):
+    """시트 셀처럼 모든 값을 문자열로 (빈 칸은 "")"""
+    return pd.DataFrame([[str(v) for v in row] for row in to_rows(df)], columns=list(df.columns), dtype=object)
+
+def _typed(df):
+    """_as_text 표를 시트에 보낼 값으로. 빈 칸이 아닌 값이 모두 숫자인 컬럼은 숫자로 되돌린다"""
+    out = df.copy()
+    for c in out.columns:
+        filled = out[c] != ""
+        num = pd.to_numeric(out[c].where(filled), errors='coerce')
+        if filled.any() and num[filled].notna().all():
+            out[c] = [(int(v) if float(v).is_integer() else float(v)) if f else "" for v, f in zip(num, filled)]
+    return out
+
+class SqliteMirror:
+    """구글 시트 4종의 로컬 SQLite 사본.
+
+    앱은 conn 대신 이 객체로 read/update 하므로 읽기는 로컬 디스크 속도이고, 시트가 느리거나
+    끊겨도 계속 동작한다. 로컬 저장은 outbox 에 쌓였다가 동기화 스레드가 변경된 행만 시트에 반영하고,
+    아직 반영 안 된 저장이 없는 워크시트는 시트의 최신 내용으로 주기적으로 갱신한다."""
+
+    # 로컬 사본은 표 전체를 바꾸는 것이 행 단위 반영보다 빠르다 (SheetWriter 가 참고)
+    row_level = False
+
+    def __init__(self, path, remote, on_change=None):
+        self.path = path
+        self.remote = remote
+        self.on_change = on_change
+        self.last_sync = None
+        self.last_error = None
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._thread = None
+        # 시트 쪽 스냅샷과 비교해 변경된 행만 올린다
+        self._pusher = SheetWriter(remote, delay=0)
+        with self._db() as db:
+            db.execute("CREATE TABLE IF NOT EXISTS outbox (worksheet TEXT PRIMARY KEY, version INTEGER, queued_at REAL)")
+            # 시트에서 한 번이라도 받아 온 워크시트. 받아 온 적 없는 표의 저장은 시트를 통째로 덮어쓸 수 있어 받지 않는다
+            db.execute("CREATE TABLE IF NOT EXISTS pulled (worksheet TEXT PRIMARY KEY, pulled_at REAL)")
+
+    def _db(self):
+        db = sqlite3.connect(self.path, timeout=30)
+        db.execute("PRAGMA journal_mode=WAL")
+        return db
+
+    def _pulled(self, db, worksheet):
+        return db.execute("SELECT 1 FROM pulled WHERE worksheet=?", (worksheet,)).fetchone() is not None
+
+    def _has_table(self, db, worksheet):
+        return db.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (worksheet,)).fetchone() is not None
+
+    def _store(self, db, worksheet, df):
+        """워크시트 표를 통째로 교체하고 이름/날짜 색인을 다시 만든다"""
+        _as_text(df).to_sql(worksheet, db, if_exists='replace', index=False)
+        for c in ['name'] + DATE_COLUMNS.get(worksheet, []):
+            if c in df.columns:
+                db.execute(f'CREATE INDEX IF NOT EXISTS "ix_{worksheet}_{c}" ON "{worksheet}" ("{c}")')
+
+    # [conn 인터페이스] read / update
+    def read(self, worksheet=None, ttl=None, **kwargs):
+        with self._lock:
+            with self._db() as db:
+                has = self._has_table(db, worksheet)
+            if not has:
+                # 처음 쓰는 워크시트는 시트에서 한 번 받아 온다. 실패하면 빈 표를 보여주지 않고 오류를 낸다
+                # (빈 표에 저장하면 나중에 시트 전체를 덮어쓰게 된다)
+                try:
+                    self.pull(worksheet)
+                except Exception as e:
+                    self.last_error = f"{worksheet}: {e}"
+                    raise
+            with self._db() as db:
+                df = pd.read_sql(f'SELECT * FROM "{worksheet}" ORDER BY rowid', db)
+        return df.replace({"": None})
+
+    def update(self, worksheet=None, data=None, **kwargs):
+        with self._lock, self._db() as db:
+            if not self._pulled(db, worksheet):
+                raise RuntimeError(f"{worksheet}: 시트에서 아직 받아 오지 못해 저장할 수 없습니다")
+            self._store(db, worksheet, data)
+            db.execute(
+                "INSERT INTO outbox VALUES (?, 1, ?) ON CONFLICT(worksheet) DO UPDATE SET version = version + 1, queued_at = excluded.queued_at",
+                (worksheet, time.time()),
+            )
+        return data
+
+    # [동기화]
+    def pending(self):
+        """{워크시트: 대기 시작 시각} — 아직 시트에 반영되지 않은 로컬 저장"""
+        with self._db() as db:
+            return dict(db.execute("SELECT worksheet, queued_at FROM outbox").fetchall())
+
+    def pull(self, worksheet):
+        """시트 내용을 받아 로컬 표를 교체. 대기 중인 로컬 저장이 있으면 덮어쓰지 않는다"""
+        raw = self.remote.read(worksheet=worksheet, ttl=0)
+        with self._lock, self._db() as db:
+            if db.execute("SELECT 1 FROM outbox WHERE worksheet=?", (worksheet,)).fetchone():
+                return False
+            text = _as_text(raw)
+            self._track(worksheet, text)
+            db.execute("INSERT OR REPLACE INTO pulled VALUES (?, ?)", (worksheet, time.time()))
+            changed = True
+            if self._has_table(db, worksheet):
+                old = pd.read_sql(f'SELECT * FROM "{worksheet}" ORDER BY rowid', db)
+                changed = list(old.columns) != list(text.columns) or to_rows(old) != to_rows(text)
+            if changed:
+                self._store(db, worksheet, text)
+        return changed
+
+    def _track(self, worksheet, text):
+        """시트 쪽 기준 상태 등록 (push 는 이것과 비교해 바뀐 행만 올린다)"""
+        self._pusher.track(worksheet, _typed(text), SheetLayout(tuple(text.columns), True, None))
+
+    def push(self, worksheet):
+        """대기 중인 로컬 저장을 시트에 반영. 그 사이 새 저장이 들어왔으면 outbox 에 남긴다"""
+        with self._db() as db:
+            row = db.execute("SELECT version FROM outbox WHERE worksheet=?", (worksheet,)).fetchone()
+            if row is None:
+                return
+            if not self._pulled(db, worksheet):
+                raise RuntimeError(f"{worksheet}: 시트에서 받아 온 적 없는 로컬 표라 반영하지 않습니다")
+            df = pd.read_sql(f'SELECT * FROM "{worksheet}" ORDER BY rowid', db)
+        if worksheet not in self._pusher.snapshots:
+            # 재시작 뒤처럼 기준 상태가 없으면 시트를 먼저 읽어 비교 기준으로 삼는다
+            self._track(worksheet, _as_text(self.remote.read(worksheet=worksheet, ttl=0)))
+        # 로컬 사본은 모두 문자열이므로 숫자 컬럼은 숫자로 되돌려 보낸다
+        self._pusher.stage(worksheet, _typed(df))
+        if worksheet in self._pusher.pending:
+            self._pusher.pending.pop(worksheet)
+            raise RuntimeError(self._pusher.last_error)
+        with self._lock, self._db() as db:
+            db.execute("DELETE FROM outbox WHERE worksheet=? AND version=?", (worksheet, row[0]))
+
+    def sync(self):
+        """대기 중인 저장을 올리고 시트 변경을 받아 온다. 바뀐 워크시트 목록 반환"""
+        changed, errors = [], []
+        for worksheet in WORKSHEETS:
+            try:
+                self.push(worksheet)
+                if self.pull(worksheet):
+                    changed.append(worksheet)
+            except Exception as e:
+                errors.append(f"{worksheet}: {e}")
+        self.last_error = "; ".join(errors) or None
+        if not errors:
+            self.last_sync = time.time()
+        if changed and self.on_change:
+            for worksheet in changed:
+                self.on_change(worksheet)
+        return changed
+
+    def start(self, interval=30):
+        """백그라운드 동기화 시작 (interval 초 간격)"""
+        if self._thread and self._thread.is_alive():
+            return
+        def loop():
+            while not self._stop.is_set():
+                self.sync()
+                self._stop.wait(interval)
+        self._thread = threading.Thread(target=loop, name="sheet-mirror-sync", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
@@ -0,0 +1,137 @@
+"""강사 시수/급여 정산 (Streamlit 없이 실행).
+
+    python payroll.py 시트내보내기.xlsx --out 정산/
+    python payroll.py 내보내기폴더/ --months 3 4 --pdf --out 정산/
+    python payroll.py 시트내보내기.xlsx --year 2027 --out 정산2027/
+    python payroll.py 시트내보내기.xlsx --format xlsx --out 정산/
+
+폴더를 주면 <워크시트>.csv (Instructors.csv, Exclusions.csv, AfterSchool.csv, Exclusions_Indiv.csv) 를 읽는다.
+--out 이 없으면 강사 × 월 표를 CSV 로 표준 출력에 쓴다.
+"""
+import argparse
+import csv
+import os
+import sys
+
+import pandas as pd
+
+from budget import AFTER_COLS
+from exclusions import ExclusionIndex
+from schedule import build_instructor_schedule, weekday_hours
+from school_year import DEFAULT_YEAR, SCHOOL_MONTHS, YEARS, get_year
+from sheets import WORKSHEETS, LocalSheetConnection, read_sheet
+from store import DataStore
+
+PAYROLL_COLS = ['year', 'name', 'month', 'days', 'reg_hours', 'aft_hours', 'rate', 'rate_after', 'reg_pay', 'aft_pay', 'pay']
+SUMMARY_COLS = ['days', 'reg_hours', 'aft_hours', 'reg_pay', 'aft_pay', 'pay']
+
+def load_store(conn):
+    """연결(구글 시트 / 로컬 대체)에서 네 시트를 읽어 DataStore 와 날짜 오류 행을 만든다"""
+    frames, issues = {}, {}
+    for ws in WORKSHEETS:
+        frames[ws], layout = read_sheet(conn, ws)
+        if not layout.invalid.empty:
+            issues[ws] = layout.invalid
+    store = DataStore(frames["Instructors"], frames["Exclusions"], frames["AfterSchool"], frames["Exclusions_Indiv"])
+    return store, issues
+
+def instructor_months(store, name, common_ex, months=SCHOOL_MONTHS, sy=None):
+    """강사 한 명의 (일정, 방과후 표, 월별 정산 행 목록). common_ex 는 sy 학년도 공휴일로 만든 색인"""
+    sy = sy or get_year()
+    row = store.instructor(name)
+    sched = build_instructor_schedule(name, weekday_hours(row), common_ex, store.indiv_for(name), sy)
+    aft = store.after_for(name, sy.year)
+    aft_by_month = aft.groupby('month')[[c for c in AFTER_COLS if c in aft.columns]].sum().sum(axis=1)
+    rate, rate_after = int(row['rate']), int(row.get('rate_after', 50000))
+    rows = []
+    for m in months:
+        reg_h, aft_h = sched.month_hours[m], int(aft_by_month.get(f"{m}월", 0))
+        rows.append({
+            'year': sy.year, 'name': name, 'month': m, 'days': sched.month_days[m],
+            'reg_hours': reg_h, 'aft_hours': aft_h, 'rate': rate, 'rate_after': rate_after,
+            'reg_pay': reg_h * rate, 'aft_pay': aft_h * rate_after, 'pay': reg_h * rate + aft_h * rate_after,
+        })
+    return sched, aft, rows
+
+def payroll_rows(store, common_ex, months=SCHOOL_MONTHS, sy=None):
+    """강사 × 월 정산 행을 강사 한 명씩 계산해 내보낸다"""
+    for name in store.names:
+        yield from instructor_months(store, name, common_ex, months, sy)[2]
+
+def write_payroll_csv(rows, out):
+    """정산 행을 받는 대로 한 줄씩 CSV 로 쓴다 (out: 텍스트 파일 객체). 쓴 행 수 반환"""
+    w = csv.DictWriter(out, fieldnames=PAYROLL_COLS, extrasaction='ignore', lineterminator='\n')
+    w.writeheader()
+    n = 0
+    for row in rows:
+        w.writerow(row)
+        n += 1
+    return n
+
+def write_payroll_xlsx(rows, out):
+    """정산 행을 XLSX 로 쓴다. write-only 모드라 행을 모아 두지 않는다 (out: 경로 또는 바이너리 파일 객체)"""
+    from openpyxl import Workbook
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("payroll")
+    ws.append(PAYROLL_COLS)
+    n = 0
+    for row in rows:
+        ws.append([row[c] for c in PAYROLL_COLS])
+        n += 1
+    wb.save(out)
+    return n
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="강사 시수/급여 정산 (시트 내보내기 파일 기준)")
+    p.add_argument("source", help="XLSX 파일 또는 <워크시트>.csv 가 있는 폴더")
+    p.add_argument("--out", help="결과 폴더 (없으면 강사 × 월 표를 표준 출력으로)")
+    p.add_argument("--year", type=int, default=DEFAULT_YEAR, choices=YEARS, help="학년도")
+    p.add_argument("--months", type=int, nargs="+", default=SCHOOL_MONTHS, choices=SCHOOL_MONTHS)
+    p.add_argument("--format", choices=["csv", "xlsx"], default="csv", help="강사 × 월 표 형식 (xlsx 는 --out 필요)")
+    p.add_argument("--pdf", action="store_true", help="월별 양식 PDF 를 ZIP 으로 함께 저장 (--out 필요)")
+    p.add_argument("--yearly", action="store_true", help="PDF ZIP 에 연간 달력 포함")
+    args = p.parse_args(argv)
+    if (args.pdf or args.format == "xlsx") and not args.out:
+        p.error("--pdf / --format xlsx 는 --out 과 함께 써야 합니다")
+    if args.pdf:
+        # PDF 모듈(fpdf/fontTools)은 필요할 때만 불러온다
+        from pdfs import PdfJob, export_pdf_zip
+
+    store, issues = load_store(LocalSheetConnection.from_path(args.source))
+    for ws, bad in issues.items():
+        print(f"[경고] {ws}: 날짜를 읽을 수 없는 행 {list(bad.index)} 는 계산에서 제외", file=sys.stderr)
+    sy = get_year(args.year)
+    common_ex = ExclusionIndex(sy.holidays, store.excl_df)
+    months = sorted(args.months)
+    jobs, summary = [], {}
+    # 강사 한 명씩 계산해 바로 쓰고, 메모리에는 강사별 합계만 남긴다
+    def rows():
+        for name in store.names:
+            sched, aft, m_rows = instructor_months(store, name, common_ex, months, sy)
+            if args.pdf:
+                jobs.append(PdfJob(store.instructor(name), sched, aft, months, args.yearly))
+            for row in m_rows:
+                acc = summary.setdefault(name, dict.fromkeys(SUMMARY_COLS, 0))
+                for c in SUMMARY_COLS:
+                    acc[c] += row[c]
+                yield row
+
+    if not args.out:
+        write_payroll_csv(rows(), sys.stdout)
+        return
+    os.makedirs(args.out, exist_ok=True)
+    if args.format == "xlsx":
+        write_payroll_xlsx(rows(), os.path.join(args.out, "payroll_monthly.xlsx"))
+    else:
+        with open(os.path.join(args.out, "payroll_monthly.csv"), "w", newline="", encoding="utf-8-sig") as f:
+            write_payroll_csv(rows(), f)
+    pd.DataFrame([{'name': n, **v} for n, v in summary.items()], columns=['name'] + SUMMARY_COLS).to_csv(
+        os.path.join(args.out, "payroll_summary.csv"), index=False, encoding="utf-8-sig")
+    if args.pdf:
+        with open(os.path.join(args.out, f"{sy.year}_수업현황_일괄.zip"), "wb") as f:
+            export_pdf_zip(jobs, out=f)
+    total = sum(v['pay'] for v in summary.values())
+    print(f"{sy.label} {len(store.names)}명 · {len(months)}개월 · 합계 {int(total):,}원 → {args.out}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
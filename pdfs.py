@@ -0,0 +1,260 @@
+import calendar
+import hashlib
+import io
+import os
+import tempfile
+import threading
+import zipfile
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from functools import lru_cache
+from multiprocessing import get_context
+
+from fontTools import subset as ftsubset
+from fpdf import FPDF
+
+import perf
+from schedule import WORK, ADD, OFF
+from sheets import safe_str
+
+# --- 2-0. 폰트 / 양식 고정부 ---
+FONT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "font.ttf")
+
+# 양식 고정 문구
+MONTHLY_INFO_W = [40, 150]
+MONTHLY_COLS = [15, 40, 25, 30, 40, 40]
+MONTHLY_HEADERS = ["연번", "날짜", "요일", "수업시수", "강사료(원)", "비고"]
+MONTHLY_MIN_ROWS = 12
+DAY_KO = ["월", "화", "수", "목", "금", "토", "일"]
+YEARLY_HEADERS = DAY_KO + ["정규h", "통합h"]
+YEARLY_COL_W = [20, 20, 20, 20, 20, 20, 20, 25, 25]
+STATUS_FILL = {WORK: (144, 238, 144), ADD: (173, 216, 230), OFF: (255, 182, 193)}
+
+# 서브셋 폰트에 항상 넣는 문자: ASCII + KS X 1001 한글 2350자 + 양식 고정 문구
+BASE_CHARS = frozenset(
+    [chr(c) for c in range(32, 127)]
+    + [chr(c) for c in range(0xAC00, 0xD7A4) if len(chr(c).encode("euc-kr", errors="ignore")) == 2]
+    + list("■~·")
+)
+
+@lru_cache(maxsize=8)
+def _subset_font_file(extra_chars):
+    """원본 TTF(4MB)를 BASE_CHARS + extra_chars 만 남긴 작은 TTF 로 한 번만 만들어 경로 반환.
+    같은 문자 집합이면 다른 프로세스가 만든 파일도 그대로 재사용한다"""
+    st = os.stat(FONT_PATH)
+    key = f"{st.st_size}-{st.st_mtime_ns}-{''.join(sorted(extra_chars))}"
+    path = os.path.join(tempfile.gettempdir(), f"lecture_time_font_{hashlib.md5(key.encode()).hexdigest()}.ttf")
+    if os.path.exists(path):
+        return path
+    try:
+        opts = ftsubset.Options(notdef_outline=True, recommended_glyphs=True)
+        opts.drop_tables += ["FFTM"]
+        font = ftsubset.load_font(FONT_PATH, opts)
+        sub = ftsubset.Subsetter(opts)
+        sub.populate(unicodes=[ord(c) for c in BASE_CHARS | extra_chars])
+        sub.subset(font)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        ftsubset.save_font(font, tmp, opts)
+        os.replace(tmp, path)
+        return path
+    except Exception:
+        return FONT_PATH
+
+def font_file(*texts):
+    """문서에 들어갈 가변 문자열 → 사용할 폰트 파일 (font.ttf 가 없으면 None)"""
+    if not os.path.exists(FONT_PATH):
+        return None
+    return _subset_font_file(frozenset("".join(texts)) - BASE_CHARS)
+
+def _new_pdf(font):
+    """새 문서. 반환값: (pdf, 글꼴 이름)"""
+    pdf = FPDF()
+    pdf.add_page()
+    if font:
+        pdf.add_font("Nanum", "", font)
+        return pdf, "Nanum"
+    return pdf, "Arial"
+
+# --- 2. PDF 생성 함수 (1: 월별 확인서) ---
+def create_monthly_pdf(target_row, month, sched):
+    # ✅ 수정 5: PDF 출력 시에도 safe_str 적용
+    name = safe_str(target_row['name'])
+    subject = safe_str(target_row.get('subject'))
+    classes = safe_str(target_row.get('target_classes'))
+    pdf, family = _new_pdf(font_file(name, subject, classes))
+
+    pdf.set_font(family, size=18)
+    pdf.cell(190, 15, txt=f"{sched.sy.label} {month} 시간강사 수업 현황", ln=True, align='C')
+    pdf.set_font(family, size=11)
+    pdf.ln(5)
+
+    col_w = MONTHLY_INFO_W
+    pdf.cell(col_w[0], 10, "성 명", 1, 0, 'C')
+    pdf.cell(col_w[1], 10, f" {name}", 1, 1, 'L')
+    pdf.cell(col_w[0], 10, "담당과목", 1, 0, 'C')
+    pdf.cell(col_w[1], 10, f" {subject}", 1, 1, 'L')
+    pdf.cell(col_w[0], 10, "담당학급", 1, 0, 'C')
+    pdf.cell(col_w[1], 10, f" {classes}", 1, 1, 'L')
+
+    m_int = int(month.replace('월',''))
+    worked_dates = sched.month_work_dates(m_int)
+    y = sched.sy.year
+    ld = calendar.monthrange(y, m_int)[1]
+    pdf.cell(col_w[0], 10, "기 간", 1, 0, 'C')
+    pdf.cell(col_w[1], 10, f" {y}. {str(m_int).zfill(2)}. 01. ~ {y}. {str(m_int).zfill(2)}. {ld}.", 1, 1, 'L')
+
+    pdf.ln(2)
+    pdf.set_fill_color(240, 240, 240)
+    cols = MONTHLY_COLS
+    for i, h in enumerate(MONTHLY_HEADERS):
+        pdf.cell(cols[i], 10, h, 1, 0, 'C', fill=True)
+    pdf.ln()
+
+    rc, th, tp = 0, 0, 0
+    rate = int(target_row['rate'])
+    for d in worked_dates:
+        rc += 1
+        h = sched.at(d)[1]
+        p = h * rate
+        pdf.cell(cols[0], 8, str(rc), 1, 0, 'C')
+        pdf.cell(cols[1], 8, d.strftime("%m월 %d일"), 1, 0, 'C')
+        pdf.cell(cols[2], 8, DAY_KO[d.weekday()], 1, 0, 'C')
+        pdf.cell(cols[3], 8, str(int(h)), 1, 0, 'C')
+        pdf.cell(cols[4], 8, f"{int(p):,}", 1, 0, 'R')
+        pdf.cell(cols[5], 8, "", 1, 1, 'C')
+        th += h
+        tp += p
+    while rc < MONTHLY_MIN_ROWS:
+        rc += 1
+        for i in range(6):
+            pdf.cell(cols[i], 8, "", 1, (1 if i==5 else 0), 'C')
+
+    pdf.set_fill_color(255, 255, 153)
+    pdf.cell(cols[0]+cols[1], 10, "합계", 1, 0, 'C', fill=True)
+    pdf.cell(cols[2], 10, f"{len(worked_dates)}일", 1, 0, 'C', fill=True)
+    pdf.cell(cols[3], 10, f"{int(th)}시간", 1, 0, 'C', fill=True)
+    pdf.cell(cols[4], 10, f"{int(tp):,}원", 1, 0, 'C', fill=True)
+    pdf.cell(cols[5], 10, "", 1, 1, 'C', fill=True)
+    return bytes(pdf.output())
+
+# --- 2-2. PDF 생성 함수 (2: 연간 통합 달력) ---
+def create_yearly_calendar_pdf(target_name, sched, cur_aft_df):
+    pdf, family = _new_pdf(font_file(str(target_name)))
+    pdf.set_font(family, size=14)
+
+    sy = sched.sy
+    pdf.cell(190, 10, txt=f"{sy.label} 연간 수업 달력 ({target_name} 선생님)", ln=True, align='C')
+    pdf.ln(5)
+    col_w = YEARLY_COL_W
+    for m, cal in sy.month_weeks.items():
+        if (m-3) % 2 == 0 and m != 3:
+            pdf.add_page()
+        pdf.set_font(family, size=12)
+        pdf.cell(190, 10, txt=f"■ {m}월 일정", ln=True)
+        pdf.set_font(family, size=9)
+        pdf.set_fill_color(230, 230, 230)
+        for i, h in enumerate(YEARLY_HEADERS): pdf.cell(col_w[i], 8, h, 1, 0, 'C', fill=True)
+        pdf.ln()
+        m_rows = cur_aft_df[cur_aft_df['month'] == f"{m}월"]
+        for w_idx, week in enumerate(cal):
+            reg_h = sched.week_hours[m][w_idx]
+            for i in range(7):
+                day = week[i]
+                fill = STATUS_FILL.get(sched.at(date(sy.year, m, day))[0]) if day != 0 else None
+                if fill: pdf.set_fill_color(*fill)
+                pdf.cell(col_w[i], 8, str(day) if day != 0 else "", 1, 0, 'C', fill=bool(fill))
+
+            aft_h = 0
+            if not m_rows.empty:
+                col_name = f'w{w_idx+1}'
+                if col_name in m_rows.columns: aft_h = int(m_rows.iloc[0][col_name])
+            pdf.set_fill_color(245, 245, 245)
+            pdf.cell(col_w[7], 8, f"{reg_h}h", 1, 0, 'C', fill=True)
+            pdf.set_fill_color(238, 246, 255)
+            pdf.cell(col_w[8], 8, f"{reg_h + aft_h}h", 1, 1, 'C', fill=True)
+        pdf.ln(5)
+    return bytes(pdf.output())
+
+# --- 2-2b. PDF 캐시 ---
+# 실제 입력 내용의 해시로 찾는 LRU. 세션과 무관하게 프로세스 안에서 공유하고 개수로 크기를 제한한다
+PDF_CACHE_SIZE = int(os.environ.get("PDF_CACHE_SIZE", "64"))
+_pdf_cache = OrderedDict()
+_pdf_lock = threading.Lock()
+
+def _memo(key, build):
+    key = hashlib.sha1(repr(key).encode()).hexdigest()
+    with _pdf_lock:
+        if key in _pdf_cache:
+            _pdf_cache.move_to_end(key)
+            return _pdf_cache[key]
+    perf.mark_miss()
+    data = build()
+    with _pdf_lock:
+        _pdf_cache[key] = data
+        while len(_pdf_cache) > PDF_CACHE_SIZE:
+            _pdf_cache.popitem(last=False)
+    return data
+
+def _row_key(target_row):
+    return tuple(safe_str(target_row.get(c)) for c in ['name', 'subject', 'target_classes', 'rate'])
+
+def _aft_key(cur_aft_df):
+    cols = [c for c in ['month', 'w1', 'w2', 'w3', 'w4', 'w5', 'w6'] if c in cur_aft_df.columns]
+    return tuple(map(tuple, cur_aft_df[cols].astype(str).itertuples(index=False, name=None)))
+
+def cached_monthly_pdf(target_row, month, sched):
+    key = ("monthly", _row_key(target_row), month, sched.fingerprint)
+    return _memo(key, lambda: create_monthly_pdf(target_row, month, sched))
+
+def cached_yearly_calendar_pdf(target_name, sched, cur_aft_df):
+    key = ("yearly", str(target_name), sched.fingerprint, _aft_key(cur_aft_df))
+    return _memo(key, lambda: create_yearly_calendar_pdf(target_name, sched, cur_aft_df))
+
+# --- 2-3. 일괄 출력 (강사 × 월 PDF 를 ZIP 하나로) ---
+# row: 강사 행, sched: InstructorSchedule, aft: 방과후 시수 df, months: [3, 4, ...], yearly: 연간 달력 포함 여부
+PdfJob = namedtuple("PdfJob", ["row", "sched", "aft", "months", "yearly"])
+
+def monthly_pdf_name(target_row, m_l, year):
+    name = safe_str(target_row['name'])
+    return f"{year}학년도 {m_l} {safe_str(target_row.get('subject', ''))} 시간강사({name}선생님) 수업 현황.pdf"
+
+def render_job(job):
+    """강사 한 명분 PDF 목록 [(ZIP 내부 경로, bytes)]"""
+    name = safe_str(job.row['name'])
+    files = []
+    for m in job.months:
+        m_l = f"{m}월"
+        files.append((f"{name}/{monthly_pdf_name(job.row, m_l, job.sched.sy.year)}", cached_monthly_pdf(job.row, m_l, job.sched)))
+    if job.yearly:
+        files.append((f"{name}/{job.sched.sy.year}_연간달력_{name}.pdf", cached_yearly_calendar_pdf(name, job.sched, job.aft)))
+    return files
+
+def _write_all(zf, results):
+    seen = set()
+    for files in results:
+        for path, data in files:
+            # 같은 이름의 강사 행이 여러 개면 뒤에 번호를 붙인다
+            base, k = path, 2
+            while path in seen:
+                path = base.replace(".pdf", f" ({k}).pdf")
+                k += 1
+            seen.add(path)
+            zf.writestr(path, data)
+
+def export_pdf_zip(jobs, out=None, max_workers=None):
+    """PdfJob 목록을 프로세스 풀에서 렌더링해 완성되는 순서대로 ZIP 에 기록.
+    out 에 파일 객체를 넘기면 그대로 쓰고, 없으면 BytesIO 를 만들어 돌려준다"""
+    out = out if out is not None else io.BytesIO()
+    jobs = list(jobs)
+    workers = min(max_workers or os.cpu_count() or 1, len(jobs)) or 1
+    # PDF 는 이미 압축돼 있으므로 ZIP 은 저장만 한다
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_STORED) as zf:
+        if workers == 1:
+            _write_all(zf, map(render_job, jobs))
+        else:
+            # Streamlit 서버는 스레드가 많으므로 fork 대신 spawn
+            with ProcessPoolExecutor(workers, mp_context=get_context("spawn")) as ex:
+                _write_all(zf, ex.map(render_job, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+    out.seek(0)
+    return out
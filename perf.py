@@ -0,0 +1,151 @@
+"""재실행(rerun) 단위 성능 측정.
+
+앱에서 켠 경우에만 PerfRecorder 가 기록하고, 꺼져 있으면 NULL 이 아무것도 하지 않는다.
+시트 읽기/쓰기처럼 여러 스레드에서 일어나는 구간은 스레드별로 activate 된 기록기에 남는다.
+"""
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager, nullcontext
+
+import numpy as np
+
+_local = threading.local()
+
+class PerfRecorder:
+    """구간(span) 시간과 캐시 적중/미스 횟수를 재실행 단위로 모은다 (최근 history 회)"""
+
+    def __init__(self, history=50):
+        self.runs = deque(maxlen=history)
+        self.cache = defaultdict(lambda: [0, 0])
+        self._lock = threading.Lock()
+        self._spans = []
+        self._label = None
+        self._started = None
+
+    @property
+    def in_run(self):
+        return self._started is not None
+
+    def start_run(self, label="전체"):
+        with self._lock:
+            self._spans, self._label, self._started = [], label, time.perf_counter()
+
+    def end_run(self):
+        with self._lock:
+            if self._started is None:
+                return
+            total = (time.perf_counter() - self._started) * 1000
+            self.runs.append({"at": time.time(), "kind": self._label, "total_ms": total, "spans": self._spans})
+            self._spans, self._started = [], None
+
+    @contextmanager
+    def span(self, name):
+        t = time.perf_counter()
+        try:
+            yield
+        finally:
+            ms = (time.perf_counter() - t) * 1000
+            with self._lock:
+                if self._started is None:
+                    # 재실행 밖의 구간은 그 자체를 한 번의 기록으로 남긴다
+                    self.runs.append({"at": time.time(), "kind": "백그라운드", "total_ms": ms, "spans": [(name, ms)]})
+                else:
+                    self._spans.append((name, ms))
+
+    def count(self, name, hit):
+        with self._lock:
+            self.cache[name][0 if hit else 1] += 1
+
+    @contextmanager
+    def cached(self, name):
+        """캐시를 거치는 호출. 안에서 mark_miss() 가 불리지 않았으면 적중으로 센다"""
+        outer = getattr(_local, 'missed', False)
+        _local.missed = False
+        try:
+            yield
+        finally:
+            self.count(name, not _local.missed)
+            _local.missed = outer
+
+    @property
+    def last_run(self):
+        return self.runs[-1] if self.runs else None
+
+    def percentiles(self):
+        """구간 이름별 (횟수, p50, p90, p99, 최대) ms — 최근 재실행 전체 기준"""
+        by_name = defaultdict(list)
+        for run in self.runs:
+            by_name[f"[{run['kind']}] 합계"].append(run["total_ms"])
+            for name, ms in run["spans"]:
+                by_name[name].append(ms)
+        rows = []
+        for name, values in by_name.items():
+            p50, p90, p99 = np.percentile(values, [50, 90, 99])
+            rows.append({"구간": name, "횟수": len(values), "p50_ms": round(p50, 1), "p90_ms": round(p90, 1),
+                         "p99_ms": round(p99, 1), "max_ms": round(max(values), 1)})
+        return sorted(rows, key=lambda r: -r["p90_ms"])
+
+    def cache_stats(self):
+        return [{"캐시": name, "적중": h, "미스": m, "적중률": f"{h / (h + m):.0%}" if h + m else "-"}
+                for name, (h, m) in sorted(self.cache.items())]
+
+    def to_json(self):
+        return json.dumps({
+            "runs": list(self.runs),
+            "percentiles": self.percentiles(),
+            "cache": {name: {"hit": h, "miss": m} for name, (h, m) in self.cache.items()},
+        }, ensure_ascii=False, indent=2)
+
+class _NullRecorder:
+    in_run = False
+    last_run = None
+
+    def start_run(self, label="전체"):
+        pass
+
+    def end_run(self):
+        pass
+
+    def span(self, name):
+        return nullcontext()
+
+    def cached(self, name):
+        return nullcontext()
+
+    def count(self, name, hit):
+        pass
+
+NULL = _NullRecorder()
+
+# 세션 밖(저장 타이머 스레드 등)에서 일어난 시트 I/O 는 여기에 남는다
+BACKGROUND = PerfRecorder()
+
+def activate(recorder):
+    """현재 스레드의 기록기 지정"""
+    _local.recorder = recorder
+
+def current():
+    return getattr(_local, 'recorder', BACKGROUND)
+
+def mark_miss():
+    """캐시된 함수 본문에서 호출 — 이번 호출은 캐시 미스"""
+    _local.missed = True
+
+class TimedConnection:
+    """conn.read / conn.update 시간을 현재 스레드의 기록기에 남기는 연결 래퍼"""
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def read(self, worksheet=None, **kwargs):
+        with current().span(f"conn.read {worksheet}"):
+            return self._conn.read(worksheet=worksheet, **kwargs)
+
+    def update(self, worksheet=None, data=None, **kwargs):
+        with current().span(f"conn.update {worksheet}"):
+            return self._conn.update(worksheet=worksheet, data=data, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
@@ -0,0 +1,146 @@
+"""예산 가정 계산 (시트에 쓰지 않는 what-if).
+
+Scenario 하나는 강사/공통 제외 표에 가정을 덮어쓴 사본이고, evaluate_scenarios 는 여러 시나리오를
+(시나리오 × 강사 × 날짜) 시수 행렬 하나로 한 번에 계산해 기준 예산과의 차이를 돌려준다.
+"""
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from budget import AFTER_COLS, WEEKDAY_COLS, _indiv_rows, build_school_calendar, combine_hours, hours_components
+from exclusions import ExclusionIndex
+from sheets import safe_str
+
+DAY_KO = ["월", "화", "수", "목", "금"]
+
+# rate_pct / rate_after_pct: 단가 증감(%), weekdays: 시수를 바꿀 요일(0=월 ~ 4=금),
+# hours_delta: 그 요일에 수업이 있는 강사의 시수 증감, excl_start / excl_end: 추가 공통 제외 기간
+Scenario = namedtuple(
+    "Scenario", ["name", "rate_pct", "rate_after_pct", "weekdays", "hours_delta", "excl_start", "excl_end"],
+    defaults=(0, 0, (), 0, None, None),
+)
+
+# 시나리오 편집 표의 컬럼 (화면용)
+SCENARIO_COLS = ["시나리오", "정규단가%", "방과후단가%", "요일", "시수증감", "추가제외_시작", "추가제외_끝"]
+
+def _scale(values, pct):
+    """단가를 pct% 만큼 올리거나 내린다 (원 단위 반올림)"""
+    v = np.asarray(pd.to_numeric(values, errors='coerce'), dtype=float)
+    v = np.nan_to_num(v)
+    return (np.rint(v * (1 + pct / 100)) if pct else v).astype(np.int64)
+
+def apply_scenario(ins_df, excl_df, sc):
+    """가정을 반영한 (강사 표, 공통 제외 표) 사본. 원본은 건드리지 않는다"""
+    ins = ins_df.copy()
+    if 'rate' in ins.columns:
+        ins['rate'] = _scale(ins['rate'], sc.rate_pct)
+    if 'rate_after' in ins.columns:
+        ins['rate_after'] = _scale(ins['rate_after'], sc.rate_after_pct)
+    for wd in sc.weekdays:
+        c = WEEKDAY_COLS[wd]
+        if c in ins.columns and sc.hours_delta:
+            h = pd.to_numeric(ins[c], errors='coerce').fillna(0).astype(int)
+            # 그 요일에 수업이 있는 강사만 바꾸고 0 아래로는 내려가지 않는다
+            ins[c] = np.where(h > 0, np.maximum(h + sc.hours_delta, 0), h)
+    excl = excl_df
+    if sc.excl_start is not None and sc.excl_end is not None:
+        extra = pd.DataFrame([{"start_date": sc.excl_start, "end_date": sc.excl_end, "note": f"[가정] {sc.name}"}])
+        excl = pd.concat([excl_df, extra], ignore_index=True) if excl_df is not None and not excl_df.empty else extra
+    return ins, excl
+
+def _after_hours(ins_df, after_df):
+    """강사 행별 방과후 시수 합계 (compute_budget 과 같은 기준)"""
+    if after_df is None or after_df.empty or 'name' not in after_df.columns:
+        return np.zeros(len(ins_df), dtype=np.int64)
+    w_cols = [c for c in AFTER_COLS if c in after_df.columns]
+    per_name = after_df.groupby('name')[w_cols].sum().sum(axis=1)
+    return ins_df['name'].map(per_name).fillna(0).astype(int).to_numpy()
+
+def _rates(ins_df):
+    rate = pd.to_numeric(ins_df['rate'], errors='coerce').fillna(0).astype(int).to_numpy()
+    if 'rate_after' in ins_df.columns:
+        rate_after = pd.to_numeric(ins_df['rate_after'], errors='coerce').fillna(0).astype(int).to_numpy()
+    else:
+        rate_after = np.full(len(ins_df), 50000)
+    return rate, rate_after
+
+def evaluate_scenarios(ins_df, indiv_df, after_df, excl_df, sy, scenarios):
+    """기준(가정 없음) + 시나리오들을 한 번에 계산.
+
+    반환: (시나리오별 합계 표, 강사 × 시나리오 급여 표). 두 표 모두 첫 열/행이 기준 예산이다."""
+    scenarios = [Scenario("기준")] + list(scenarios)
+    cal = build_school_calendar(ExclusionIndex(sy.holidays, excl_df), sy)
+
+    # 요일 시수가 바뀐 시나리오만 시수 성분을 다시 만들고 나머지는 기준 성분을 그대로 쓴다
+    ind = _indiv_rows(ins_df, indiv_df, cal)
+    base0, off, addv0 = hours_components(ins_df, indiv_df, cal, ind)
+    base, addv = [], []
+    for sc in scenarios:
+        b, a = (base0, addv0)
+        if sc.weekdays and sc.hours_delta:
+            b, _, a = hours_components(apply_scenario(ins_df, None, sc)[0], indiv_df, cal, ind)
+        base.append(b)
+        addv.append(a)
+    base, addv = np.stack(base).astype(np.int32), np.stack(addv).astype(np.int32)
+
+    # 추가 제외 기간은 기준 제외 여부에 OR (공통 제외 색인을 다시 만들 필요 없음)
+    ords = np.array([d.toordinal() for d in sy.dates])
+    excluded = np.stack([
+        cal['excluded'].to_numpy() | ((ords >= sc.excl_start.toordinal()) & (ords <= sc.excl_end.toordinal()))
+        if sc.excl_start is not None and sc.excl_end is not None else cal['excluded'].to_numpy()
+        for sc in scenarios
+    ])
+
+    # (시나리오 × 강사 × 날짜) 정규 시수
+    hours, worked = combine_hours(base, off[None], addv, excluded[:, None, :])
+    reg_h = hours.sum(axis=2, dtype=np.int64)
+    days = worked.sum(axis=2)
+    rate0, rate_after0 = _rates(ins_df)
+    rate = np.stack([_scale(rate0, sc.rate_pct) for sc in scenarios])
+    rate_after = np.stack([_scale(rate_after0, sc.rate_after_pct) for sc in scenarios])
+    aft_h = _after_hours(ins_df, after_df)
+    pay = reg_h * rate + aft_h[None] * rate_after
+
+    total = pay.sum(axis=1)
+    summary = pd.DataFrame({
+        'scenario': [sc.name for sc in scenarios],
+        'days': days.sum(axis=1), 'reg_hours': reg_h.sum(axis=1), 'aft_hours': int(aft_h.sum()),
+        'pay': total, 'delta': total - total[0],
+        'delta_pct': np.round((total - total[0]) / total[0] * 100, 2) if total[0] else 0.0,
+    })
+    names = ins_df['name'].to_numpy() if 'name' in ins_df.columns else np.arange(len(ins_df))
+    per_instructor = pd.DataFrame(pay.T, columns=summary['scenario'])
+    per_instructor.insert(0, 'name', names)
+    return summary, per_instructor
+
+def _num(v):
+    v = pd.to_numeric(v, errors='coerce')
+    return 0 if pd.isna(v) else v
+
+def _day(v):
+    if v is None or (not isinstance(v, str) and pd.isna(v)) or v == "":
+        return None
+    d = pd.to_datetime(v, errors='coerce')
+    return None if pd.isna(d) else d.date()
+
+def scenarios_from_table(df):
+    """시나리오 편집 표(SCENARIO_COLS) → Scenario 목록. 이름이 빈 행은 건너뛴다"""
+    out, seen = [], {"기준"}
+    for row in df.to_dict('records'):
+        name = safe_str(row.get("시나리오"), "")
+        if not name:
+            continue
+        # 결과 표의 열 이름으로 쓰므로 겹치는 이름은 뒤에 번호를 붙인다
+        base, k = name, 2
+        while name in seen:
+            name = f"{base} ({k})"
+            k += 1
+        seen.add(name)
+        days = [DAY_KO.index(d) for d in safe_str(row.get("요일"), "").replace(" ", "").split(",") if d in DAY_KO]
+        out.append(Scenario(
+            name, float(_num(row.get("정규단가%"))), float(_num(row.get("방과후단가%"))),
+            tuple(days), int(_num(row.get("시수증감"))),
+            _day(row.get("추가제외_시작")), _day(row.get("추가제외_끝")),
+        ))
+    return out
@@ -0,0 +1,121 @@
+import hashlib
+import numpy as np
+import pandas as pd
+
+from budget import get_regular_hours
+from school_year import get_year
+from sheets import safe_str
+
+# 날짜 상태: 정규 출근 / 추가출근 / 제외(공휴일·방학·개인휴무) / 해당 없음
+WORK, ADD, OFF, NONE = "work", "add", "off", ""
+
+class InstructorSchedule:
+    """강사 한 명의 학년도 일정.
+
+    날짜별 (상태, 시수, 툴팁)을 학기 시작일 기준 배열로 들고 있어 날짜 조회는 O(1)이고,
+    주/월 합계도 여기서 한 번만 계산해 화면·PDF·합계가 같은 값을 쓴다."""
+
+    def __init__(self, hm, common_ex, personal_tips, adds, added_hours=None, sy=None):
+        self.hm = hm
+        self.sy = sy = sy or get_year()
+        self.start, self.end = sy.start, sy.end
+        n = len(sy.dates)
+        self.dates = sy.dates
+        self.status = np.full(n, NONE, dtype=object)
+        self.hours = np.zeros(n, dtype=np.int64)
+        self.tooltip = np.full(n, "", dtype=object)
+        # 공통 제외는 색인에서 한 번에, 개인 일정(개인휴무/추가출근)은 그 위에 덮어쓴다
+        common = common_ex.mask(self.dates)
+        for k, d in enumerate(self.dates):
+            tip = personal_tips.get(d)
+            if tip is None and common[k]:
+                tip = common_ex.label(d)
+            if d in adds:
+                self.status[k] = ADD
+            elif d.weekday() < 5 and tip is None and hm.get(d.weekday(), 0) > 0:
+                self.status[k] = WORK
+            elif tip is not None:
+                self.status[k] = OFF
+            if self.status[k] in (WORK, ADD):
+                self.hours[k] = get_regular_hours(d, hm, added_hours)
+            if tip is not None:
+                self.tooltip[k] = tip
+
+        self._fingerprint = None
+        worked = (self.status == WORK) | (self.status == ADD)
+        self.worked = worked
+        # 주별 합계는 학년도 달력의 주 구성(w1~w6)을 그대로 따른다
+        self.month_days, self.month_hours, self.week_hours = {}, {}, {}
+        for m in sy.months:
+            mask = sy.month == m
+            self.month_days[m] = int(worked[mask].sum())
+            self.month_hours[m] = int(self.hours[mask].sum())
+            self.week_hours[m] = np.bincount(
+                sy.week[mask], weights=self.hours[mask], minlength=len(sy.month_weeks[m])
+            ).astype(int).tolist()
+
+    def _pos(self, d):
+        return self.sy.pos(d)
+
+    def at(self, d):
+        """(상태, 시수, 툴팁)"""
+        k = self._pos(d)
+        if k is None:
+            return NONE, 0, ""
+        return self.status[k], int(self.hours[k]), self.tooltip[k]
+
+    @property
+    def fingerprint(self):
+        """날짜별 상태/시수/툴팁 내용 해시 (PDF 캐시 키)"""
+        if self._fingerprint is None:
+            h = hashlib.sha1(f"{self.start}|{self.end}|".encode())
+            h.update("\x1f".join(self.status).encode())
+            h.update(self.hours.tobytes())
+            h.update("\x1f".join(self.tooltip).encode())
+            self._fingerprint = h.hexdigest()
+        return self._fingerprint
+
+    def month_cells(self, month):
+        """해당 월 1일~말일의 (상태, 툴팁) 튜플 (달력 HTML 캐시 키)"""
+        first, n = self.sy.month_span(month)
+        if first is None:
+            return ((NONE, ""),) * n
+        return tuple(zip(self.status[first:first + n].tolist(), self.tooltip[first:first + n].tolist()))
+
+    def month_work_dates(self, m):
+        """해당 월의 출근일 목록"""
+        first, n = self.sy.month_span(m)
+        if first is None:
+            return []
+        return [d for d, w in zip(self.dates[first:first + n], self.worked[first:first + n]) if w]
+
+def weekday_hours(ins_row):
+    """강사 행 → {요일: 시수}"""
+    return {0: int(ins_row['mon']), 1: int(ins_row['tue']), 2: int(ins_row['wed']), 3: int(ins_row['thu']), 4: int(ins_row['fri'])}
+
+def build_instructor_schedule(target, hm, common_ex, indiv_df, sy=None):
+    """개인 일정(개인휴무/추가출근)을 반영한 강사 일정"""
+    tips = {}
+    # ✅ t_ind_df 재참조 안전하게 처리
+    t_ind_df = indiv_df[indiv_df['name']==target].copy()
+    if 'note' in t_ind_df.columns:
+        t_ind_df['note'] = t_ind_df['note'].fillna('').astype(str).replace({'nan':'','None':''})
+    if 'hours' not in t_ind_df.columns:
+        t_ind_df['hours'] = 0
+    t_ind_df['hours'] = pd.to_numeric(t_ind_df['hours'], errors='coerce').fillna(0).astype(int)
+
+    adds = set()
+    add_hours = {}
+    for td_d, typ, hours, note in zip(t_ind_df['date'], t_ind_df['type'], t_ind_df['hours'], t_ind_df['note']):
+        # 날짜를 읽을 수 없는 행은 불러올 때 이미 걸러지고, 편집 중 비워 둔 날짜만 남을 수 있다
+        if pd.isna(td_d):
+            continue
+        note_val = safe_str(note, '')
+        if typ == '개인휴무':
+            tips[td_d] = f"[개인] {note_val}".strip()
+        else:
+            adds.add(td_d)
+            add_hours[td_d] = int(hours)
+            tips[td_d] = f"[추가] {note_val}".strip()
+    
+    return InstructorSchedule(hm, common_ex, tips, adds, add_hours, sy)
@@ -0,0 +1,117 @@
+"""학년도별 달력 (공휴일 · 수업일 · 월별 주 구성).
+
+학년도마다 SchoolYear 를 한 번만 만들어(get_year) 화면 · 합계 · PDF 가 같은 구조를 쓴다.
+"""
+import calendar
+import os
+from datetime import date, timedelta
+from functools import lru_cache
+
+import numpy as np
+
+# 수업 기간 (3월 ~ 12월)
+SCHOOL_MONTHS = list(range(3, 13))
+
+# year 컬럼이 없던 AfterSchool 시트의 행은 이 학년도 자료로 본다
+LEGACY_YEAR = 2026
+
+# 해마다 날짜가 같은 공휴일 (월, 일, 이름, 대체공휴일 대상 여부)
+FIXED_HOLIDAYS = [
+    (1, 1, "신정", False), (3, 1, "삼일절", True), (5, 5, "어린이날", True), (6, 6, "현충일", False),
+    (8, 15, "광복절", True), (10, 3, "개천절", True), (10, 9, "한글날", True), (12, 25, "성탄절", True),
+]
+
+# 해마다 날짜가 바뀌는 공휴일 (음력 공휴일, 선거일, 임시공휴일). 새 학년도는 여기에 추가
+YEARLY_HOLIDAYS = {
+    2025: {
+        "설날": [date(2025, 1, 28), date(2025, 1, 29), date(2025, 1, 30)],
+        "임시공휴일": [date(2025, 1, 27)],
+        "부처님오신날": [date(2025, 5, 5)],
+        "대통령선거일": [date(2025, 6, 3)],
+        "추석": [date(2025, 10, 5), date(2025, 10, 6), date(2025, 10, 7)],
+    },
+    2026: {
+        "설날": [date(2026, 2, 16), date(2026, 2, 17), date(2026, 2, 18)],
+        "부처님오신날": [date(2026, 5, 24)],
+        "지방선거일": [date(2026, 6, 3)],
+        "추석": [date(2026, 9, 24), date(2026, 9, 25), date(2026, 9, 26)],
+    },
+    2027: {
+        "설날": [date(2027, 2, 6), date(2027, 2, 7), date(2027, 2, 8)],
+        "부처님오신날": [date(2027, 5, 13)],
+        "추석": [date(2027, 9, 14), date(2027, 9, 15), date(2027, 9, 16)],
+    },
+}
+YEARS = sorted(YEARLY_HOLIDAYS)
+
+DEFAULT_YEAR = int(os.environ.get("SCHOOL_YEAR", LEGACY_YEAR))
+if DEFAULT_YEAR not in YEARLY_HOLIDAYS:
+    # 표에 없는 해는 설날/추석/선거일/대체공휴일이 빠진 채 계산되므로 시작하지 않는다
+    raise ValueError(f"SCHOOL_YEAR={DEFAULT_YEAR}: 공휴일 표(YEARLY_HOLIDAYS)가 없는 학년도입니다 ({', '.join(map(str, YEARS))} 중 선택)")
+
+# 대체공휴일 대상: 설날/추석은 일요일, 나머지는 토·일요일과 겹치거나 다른 공휴일과 겹칠 때
+_SUB_WEEKEND = {"설날": {6}, "추석": {6}, "부처님오신날": {5, 6}}
+
+def holidays_for(year):
+    """{날짜: 이름} — 대체공휴일 포함"""
+    if year not in YEARLY_HOLIDAYS:
+        raise ValueError(f"{year}학년도 공휴일 표가 없습니다 (YEARLY_HOLIDAYS 에 추가 필요)")
+    names, groups = {}, []
+    for m, d, name, sub in FIXED_HOLIDAYS:
+        day = date(year, m, d)
+        names.setdefault(day, []).append(name)
+        if sub:
+            groups.append((name, [day]))
+    for name, days in YEARLY_HOLIDAYS.get(year, {}).items():
+        for day in days:
+            names.setdefault(day, []).append(name)
+        if name in _SUB_WEEKEND:
+            groups.append((name, days))
+
+    out = {d: "·".join(n) for d, n in names.items()}
+    # 겹친 날은 한 번만 센다 (어린이날·부처님오신날이 같은 날이면 대체공휴일 하루)
+    counted = set()
+    for name, days in sorted(groups, key=lambda g: g[1][0]):
+        weekend = _SUB_WEEKEND.get(name, {5, 6})
+        need = [d for d in days if d not in counted and (d.weekday() in weekend or len(names[d]) > 1)]
+        counted.update(need)
+        d = days[-1]
+        for _ in need:
+            d += timedelta(1)
+            while d.weekday() >= 5 or d in out:
+                d += timedelta(1)
+            out[d] = "대체공휴일"
+    return dict(sorted(out.items()))
+
+class SchoolYear:
+    """한 학년도의 날짜 배열과 월별 주 구성.
+
+    dates 는 3월 1일부터 12월 31일까지이고, week 는 각 날짜가 calendar.monthcalendar 의
+    몇 번째 주(행)인지, 즉 AfterSchool 의 w1~w6 중 어느 컬럼인지를 나타낸다."""
+
+    def __init__(self, year, months=SCHOOL_MONTHS):
+        self.year = year
+        self.months = list(months)
+        self.label = f"{year}학년도"
+        self.start = date(year, self.months[0], 1)
+        self.end = date(year, self.months[-1], calendar.monthrange(year, self.months[-1])[1])
+        self.holidays = holidays_for(year)
+        self.dates = [self.start + timedelta(k) for k in range((self.end - self.start).days + 1)]
+        self.weekday = np.array([d.weekday() for d in self.dates])
+        self.month = np.array([d.month for d in self.dates])
+        self.month_weeks = {m: calendar.monthcalendar(year, m) for m in self.months}
+        self.week_cols = {m: [f"w{i + 1}" for i in range(len(w))] for m, w in self.month_weeks.items()}
+        self.week = np.array([(d.day - 1 + calendar.monthrange(year, d.month)[0]) // 7 for d in self.dates])
+
+    def pos(self, d):
+        """학년도 시작일 기준 위치 (기간 밖이면 None)"""
+        k = (d - self.start).days
+        return k if 0 <= k < len(self.dates) else None
+
+    def month_span(self, m):
+        """그 달의 (시작 위치, 일수)"""
+        return self.pos(date(self.year, m, 1)), calendar.monthrange(self.year, m)[1]
+
+@lru_cache(maxsize=None)
+def get_year(year=DEFAULT_YEAR):
+    return SchoolYear(year)
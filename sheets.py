@@ -0,0 +1,388 @@
+import difflib
+import os
+import threading
+from collections import namedtuple
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+from school_year import LEGACY_YEAR, SCHOOL_MONTHS
+
+# 구글 시트 워크시트 이름
+WORKSHEETS = ["Instructors", "Exclusions", "AfterSchool", "Exclusions_Indiv"]
+
+# 워크시트별 기본 헤더 (내보내기 파일에 시트가 없을 때 빈 표로 사용)
+SHEET_COLUMNS = {
+    "Instructors": ['name', 'rate', 'rate_after', 'mon', 'tue', 'wed', 'thu', 'fri', 'subject', 'target_classes'],
+    "Exclusions": ['start_date', 'end_date', 'note'],
+    "AfterSchool": ['name', 'month', 'w1', 'w2', 'w3', 'w4', 'w5', 'w6', 'year'],
+    "Exclusions_Indiv": ['name', 'date', 'type', 'hours', 'note'],
+}
+
+# 읽을 때 한 번만 date 로 변환하는 날짜 컬럼 (시트에는 ISO 문자열로 저장)
+DATE_COLUMNS = {
+    "Exclusions": ['start_date', 'end_date'],
+    "Exclusions_Indiv": ['date'],
+}
+
+# ✅ 수정 1: None을 안전하게 문자열로 변환하는 헬퍼 함수 추가
+def safe_str(val, default="-"):
+    """None, NaN, 빈값을 모두 default로 치환"""
+    if val is None:
+        return default
+    if isinstance(val, float) and pd.isna(val):
+        return default
+    s = str(val).strip()
+    return s if s and s.lower() != "nan" and s.lower() != "none" else default
+
+# [기본 데이터 틀 생성 함수]
+def get_initial_after_df(target_name, year=LEGACY_YEAR):
+    months = [f"{m}월" for m in SCHOOL_MONTHS]
+    n = len(months)
+    return pd.DataFrame({
+        "name": [target_name]*n, "month": months,
+        "w1": [0]*n, "w2": [0]*n, "w3": [0]*n, "w4": [0]*n, "w5": [0]*n, "w6": [0]*n, "year": [year]*n
+    })
+
+# [시트별 정규화 함수] conn.read 결과를 앱에서 쓰는 형태로 맞춘다
+def normalize_instructors(df_ins):
+    for c in ['rate', 'rate_after', 'mon', 'tue', 'wed', 'thu', 'fri']:
+        if c in df_ins.columns:
+            df_ins[c] = pd.to_numeric(df_ins[c], errors='coerce').fillna(0).astype(int)
+
+    # ✅ 수정 2: 문자열 컬럼의 None/NaN을 빈 문자열로 치환
+    for c in ['name', 'subject', 'target_classes']:
+        if c in df_ins.columns:
+            df_ins[c] = df_ins[c].fillna('').astype(str).str.strip()
+    # 이름이 빈 행 제거 (GSheets 하단 빈 행 방지)
+    return df_ins[df_ins['name'] != '']
+
+def normalize_exclusions(df_excl):
+    # ✅ 수정 3: 제외일정의 note None 처리
+    if 'note' in df_excl.columns:
+        df_excl['note'] = df_excl['note'].fillna('').astype(str).str.strip()
+        df_excl['note'] = df_excl['note'].replace({'nan': '', 'None': ''})
+    for c in ['start_date', 'end_date']:
+        if c in df_excl.columns:
+            df_excl[c] = df_excl[c].fillna('').astype(str).str.strip()
+    return df_excl[df_excl['start_date'] != '']
+
+def normalize_after(df_aft):
+    for c in ['w1', 'w2', 'w3', 'w4', 'w5', 'w6']:
+        if c not in df_aft.columns:
+            df_aft[c] = 0
+        df_aft[c] = pd.to_numeric(df_aft[c], errors='coerce').fillna(0).astype(int)
+    # 학년도 컬럼이 없던 시트(또는 빈 칸)는 LEGACY_YEAR 자료
+    if 'year' not in df_aft.columns:
+        df_aft['year'] = LEGACY_YEAR
+    df_aft['year'] = pd.to_numeric(df_aft['year'], errors='coerce').fillna(LEGACY_YEAR).astype(int)
+    return df_aft
+
+def normalize_indiv(df_indiv):
+    for c in ['name', 'date', 'type', 'hours', 'note']:
+        if c not in df_indiv.columns:
+            df_indiv[c] = 0 if c == 'hours' else ''
+    # ✅ 수정 4: 개인일정의 note/date None 처리
+    if not df_indiv.empty:
+        df_indiv['note'] = df_indiv['note'].fillna('').astype(str).str.strip()
+        df_indiv['note'] = df_indiv['note'].replace({'nan': '', 'None': ''})
+        for c in ['name', 'type', 'date']:
+            df_indiv[c] = df_indiv[c].fillna('').astype(str).str.strip()
+        df_indiv['hours'] = pd.to_numeric(df_indiv['hours'], errors='coerce').fillna(0).astype(int)
+        df_indiv = df_indiv[df_indiv['date'] != '']
+    return df_indiv
+
+NORMALIZERS = {
+    "Instructors": normalize_instructors,
+    "Exclusions": normalize_exclusions,
+    "AfterSchool": normalize_after,
+    "Exclusions_Indiv": normalize_indiv,
+}
+
+def parse_date_columns(df, cols):
+    """날짜 문자열 컬럼을 한 번에 date 로 변환. (변환된 DataFrame, 날짜를 읽을 수 없는 행의 index) 반환"""
+    bad = pd.Series(False, index=df.index)
+    for c in cols:
+        if c in df.columns:
+            parsed = pd.to_datetime(df[c], format='ISO8601', errors='coerce')
+            bad |= parsed.isna()
+            df[c] = parsed.dt.date
+    return df[~bad], df.index[bad]
+
+# [시트 레이아웃] 실제 시트의 헤더, 정규화된 행이 시트 2행부터 빈틈없이 이어지는지 여부,
+# 날짜를 읽을 수 없어 계산에서 뺀 원본 행 (index = 시트 행 번호)
+SheetLayout = namedtuple("SheetLayout", ["columns", "aligned", "invalid"])
+
+def read_sheet(conn, worksheet):
+    """워크시트 하나를 읽어 정규화 (캐시 없이 항상 원격 조회). (DataFrame, SheetLayout) 반환"""
+    raw = conn.read(worksheet=worksheet, ttl=0)
+    columns = tuple(raw.columns)
+    raw.index = range(2, len(raw) + 2)
+    df = NORMALIZERS[worksheet](raw.copy())
+    df, bad = parse_date_columns(df, DATE_COLUMNS.get(worksheet, []))
+    # 정규화에서 빈 행이 빠졌거나 컬럼이 추가됐다면 행 위치를 믿을 수 없으므로 첫 저장은 전체 덮어쓰기
+    # (날짜 오류 행이 시트 맨 아래에 모여 있는 것은 괜찮다. 저장할 때 그 자리에 그대로 둔다)
+    aligned = list(bad) == list(range(len(df) + 2, len(raw) + 2)) and tuple(df.columns) == columns
+    return df.reset_index(drop=True), SheetLayout(columns, aligned, raw.loc[bad])
+
+def _cell(v):
+    """DataFrame 값을 시트 셀 값으로 변환"""
+    if v is None or v is pd.NaT or (isinstance(v, float) and pd.isna(v)):
+        return ""
+    if isinstance(v, datetime):
+        v = v.date()
+    if isinstance(v, date):
+        return v.isoformat()
+    if isinstance(v, np.integer):
+        return int(v)
+    if isinstance(v, np.floating):
+        v = float(v)
+    if isinstance(v, float):
+        return int(v) if v.is_integer() else v
+    if isinstance(v, np.bool_):
+        return bool(v)
+    return v
+
+def to_rows(df, columns=None):
+    columns = list(columns if columns is not None else df.columns)
+    return [tuple(_cell(v) for v in row) for row in df[columns].itertuples(index=False, name=None)]
+
+def _col_letter(n):
+    s = ""
+    while n:
+        n, r = divmod(n - 1, 26)
+        s = chr(65 + r) + s
+    return s
+
+def diff_ops(old_rows, new_rows):
+    """이전/현재 행 목록의 최소 변경 (values, structural).
+    structural 은 이전 시트 행 번호 기준(헤더=1행)의 ('delete', 시작, 끝) / ('insert', 위치, 행들)로 아래쪽부터 적용하는 순서이고,
+    values 는 삽입/삭제를 모두 적용한 뒤의 행 번호 기준으로 쓸 (시작 행, 행들) 목록이다"""
+    values, structural = [], []
+    sm = difflib.SequenceMatcher(None, old_rows, new_rows, autojunk=False)
+    for tag, i1, i2, j1, j2 in sm.get_opcodes():
+        if tag == 'equal':
+            continue
+        if j2 > j1:
+            values.append((j1 + 2, new_rows[j1:j2]))
+        n = min(i2 - i1, j2 - j1)
+        if i2 - i1 > n:
+            structural.append(('delete', i1 + n + 2, i2 + 1))
+        if j2 - j1 > n:
+            structural.append(('insert', i1 + n + 2, new_rows[j1 + n:j2]))
+    return values, structural[::-1]
+
+def _row_requests(sheet_id, structural):
+    """diff_ops 의 삽입/삭제 → 스프레드시트 batch_update 요청 목록 (빈 행을 넣고 값은 따로 쓴다)"""
+    def rows_range(row, n):
+        return {'sheetId': sheet_id, 'dimension': 'ROWS', 'startIndex': row - 1, 'endIndex': row - 1 + n}
+
+    requests = []
+    for op in structural:
+        if op[0] == 'delete':
+            requests.append({'deleteDimension': {'range': rows_range(op[1], op[2] - op[1] + 1)}})
+        else:
+            requests.append({'insertDimension': {'range': rows_range(op[1], len(op[2])), 'inheritFromBefore': op[1] > 2}})
+    return requests
+
+class SheetWriter:
+    """변경된 행만 시트에 반영하는 쓰기 계층.
+
+    stage() 로 저장 요청을 모아 두었다가 delay 초 동안 추가 저장이 없으면 한 번에 flush 한다.
+    같은 워크시트를 여러 번 저장하면 마지막 상태만 직전 스냅샷과 비교해 반영한다.
+    날짜를 읽을 수 없던 행은 지우지 않고 시트 맨 아래에 그대로 남긴다."""
+
+    # 저장 한 번에 행 삽입/삭제가 이보다 많으면 전체 교체
+    max_structural = 10
+
+    def __init__(self, conn, delay=1.5, on_flush=None):
+        self.conn = conn
+        self.delay = delay
+        self.on_flush = on_flush
+        self.snapshots = {}
+        self.pending = {}
+        self.last_error = None
+        self._lock = threading.RLock()
+        self._timer = None
+
+    def track(self, worksheet, df, layout):
+        """시트에서 새로 읽은 상태를 비교 기준으로 등록"""
+        with self._lock:
+            rows = to_rows(df, layout.columns) + self._carried(layout, layout.columns) if layout.aligned else None
+            self.snapshots[worksheet] = (rows, layout)
+
+    def _carried(self, layout, columns):
+        if layout is None or layout.invalid is None or layout.invalid.empty:
+            return []
+        return to_rows(layout.invalid.reindex(columns=columns))
+
+    def stage(self, worksheet, df):
+        with self._lock:
+            self.pending[worksheet] = df.copy()
+            if self._timer:
+                self._timer.cancel()
+            if self.delay <= 0:
+                self._timer = None
+                self.flush()
+                return
+            self._timer = threading.Timer(self.delay, self.flush)
+            self._timer.start()
+
+    def flush(self):
+        with self._lock:
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+            pending, self.pending = self.pending, {}
+            for worksheet, df in pending.items():
+                try:
+                    self._push(worksheet, df)
+                    self.last_error = None
+                except Exception as e:
+                    # 실패한 저장은 다음 flush 때 다시 시도 (그 사이 더 새 저장이 들어왔으면 그것 우선)
+                    self.pending.setdefault(worksheet, df)
+                    self.last_error = f"{worksheet}: {e}"
+                    continue
+                if self.on_flush:
+                    self.on_flush(worksheet)
+
+    def _push(self, worksheet, df):
+        old_rows, layout = self.snapshots.get(worksheet, (None, None))
+        columns = list(layout.columns) if layout else list(df.columns)
+        # 행 단위 API 가 없는 연결(로컬 사본 등)은 전체 교체
+        if old_rows is None or set(columns) != set(df.columns) or not getattr(self.conn, 'row_level', True):
+            self._rewrite(worksheet, df)
+            return
+        new_rows = to_rows(df, columns) + self._carried(layout, columns)
+        values, structural = diff_ops(old_rows, new_rows)
+        # 행 삽입/삭제가 많으면 요청을 길게 만드는 것보다 표 전체를 한 번에 쓰는 편이 낫다
+        if len(structural) > self.max_structural:
+            self._rewrite(worksheet, df)
+            return
+        if values or structural:
+            try:
+                ws = open_worksheet(self.conn, worksheet)
+                # 스냅샷은 캐시 TTL 만큼 오래됐을 수 있다. 그 사이 시트에서 행이 직접 추가/삭제됐으면
+                # 행 번호가 어긋나 다른 행을 덮어쓰므로 전체를 다시 쓴다
+                if not self._live_matches(ws, old_rows, columns, worksheet):
+                    self._rewrite(worksheet, df)
+                    return
+                if structural:
+                    ws.spreadsheet.batch_update({'requests': _row_requests(ws.id, structural)})
+                # 값은 conn.update 와 같은 USER_ENTERED 로 써야 날짜/숫자 셀 형식이 다른 행과 같다
+                last = _col_letter(len(columns))
+                if values:
+                    ws.batch_update([
+                        {'range': f"A{r}:{last}{r + len(rows) - 1}", 'values': [list(x) for x in rows]}
+                        for r, rows in values
+                    ], value_input_option='USER_ENTERED')
+            except Exception:
+                # 반영 결과를 알 수 없으면 전체를 다시 쓴다
+                self._rewrite(worksheet, df)
+                return
+        self.snapshots[worksheet] = (new_rows, SheetLayout(tuple(columns), True, layout.invalid))
+
+    def _live_matches(self, ws, old_rows, columns, worksheet):
+        """시트의 첫 열이 스냅샷과 같은지 (행 수, 그리고 날짜 열이 아니면 값까지)"""
+        live = ws.col_values(1)[1:]
+        if len(live) != len(old_rows):
+            return False
+        # 날짜 셀은 시트 표시 형식으로 돌아오므로 행 수만 비교한다
+        if columns[0] in DATE_COLUMNS.get(worksheet, []):
+            return True
+        return [str(v) for v in live] == [str(r[0]) for r in old_rows]
+
+    def _rewrite(self, worksheet, df):
+        layout = self.snapshots.get(worksheet, (None, None))[1]
+        columns = list(df.columns)
+        rows = to_rows(df) + self._carried(layout, columns)
+        self.conn.update(worksheet=worksheet, data=pd.DataFrame(rows, columns=columns))
+        self.snapshots[worksheet] = (rows, SheetLayout(tuple(columns), True, layout.invalid if layout else None))
+
+def open_worksheet(conn, worksheet):
+    """행 단위 반영에 쓰는 워크시트 핸들 (id, col_values, batch_update, spreadsheet.batch_update)"""
+    if hasattr(conn, 'worksheet'):
+        return conn.worksheet(worksheet)
+    return conn.client._select_worksheet(worksheet=worksheet)
+
+# [로컬 대체 연결] 구글 시트 없이 읽기/쓰기/행 단위 변경을 흉내낸다 (오프라인 테스트용)
+class LocalSheetConnection:
+    def __init__(self, frames=None):
+        self.grids = {}
+        self.calls = []
+        for name, df in (frames or {}).items():
+            self._set(name, df)
+
+    @classmethod
+    def from_path(cls, path):
+        """시트 내보내기 파일로 만든 연결. XLSX 는 워크시트 이름 그대로, 폴더는 <워크시트>.csv"""
+        if os.path.isdir(path):
+            frames = {ws: pd.read_csv(os.path.join(path, f"{ws}.csv"), dtype=str, keep_default_na=False)
+                      for ws in WORKSHEETS if os.path.exists(os.path.join(path, f"{ws}.csv"))}
+        else:
+            frames = pd.read_excel(path, sheet_name=None, dtype=str, keep_default_na=False)
+        return cls({ws: frames.get(ws, pd.DataFrame(columns=cols)) for ws, cols in SHEET_COLUMNS.items()})
+
+    def _set(self, worksheet, df):
+        self.grids[worksheet] = [list(df.columns)] + [list(r) for r in to_rows(df)]
+
+    def read(self, worksheet=None, ttl=None, **kwargs):
+        self.calls.append(('read', worksheet))
+        grid = self.grids.get(worksheet, [[]])
+        return pd.DataFrame(grid[1:], columns=grid[0]).replace({"": None})
+
+    def update(self, worksheet=None, data=None, **kwargs):
+        self.calls.append(('update', worksheet))
+        self._set(worksheet, data)
+        return data
+
+    def worksheet(self, worksheet):
+        return _LocalWorksheet(self, worksheet)
+
+class _LocalWorksheet:
+    def __init__(self, conn, name):
+        self.conn, self.name = conn, name
+        # 로컬 연결에서는 워크시트 이름을 sheetId 로 쓴다
+        self.id = name
+        self.spreadsheet = _LocalSpreadsheet(conn)
+
+    @property
+    def grid(self):
+        return self.conn.grids[self.name]
+
+    def col_values(self, col):
+        """gspread 처럼 표시 문자열로, 끝의 빈 칸은 빼고 돌려준다"""
+        self.conn.calls.append(('col_values', self.name))
+        values = [str(r[col - 1]) if col - 1 < len(r) else "" for r in self.grid]
+        while values and values[-1] == "":
+            values.pop()
+        return values
+
+    def batch_update(self, data, value_input_option=None, **kwargs):
+        # 값 쓰기는 conn.update 와 같은 USER_ENTERED 만 쓴다
+        if value_input_option != 'USER_ENTERED':
+            raise ValueError(value_input_option)
+        self.conn.calls.append(('batch_update', self.name))
+        for item in data:
+            start = int(''.join(ch for ch in item['range'].split(':')[0] if ch.isdigit()))
+            for k, row in enumerate(item['values']):
+                self.grid[start - 1 + k] = list(row)
+
+class _LocalSpreadsheet:
+    """스프레드시트 batch_update 중 SheetWriter 가 쓰는 요청(insertDimension / deleteDimension)만 지원"""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def batch_update(self, body):
+        requests = body['requests']
+        self.conn.calls.append(('spreadsheet_batch_update', [next(iter(r)) for r in requests]))
+        for req in requests:
+            kind, arg = next(iter(req.items()))
+            rng = arg['range']
+            grid = self.conn.grids[rng['sheetId']]
+            if kind == 'insertDimension':
+                grid[rng['startIndex']:rng['startIndex']] = [[""] * len(grid[0]) for _ in range(rng['endIndex'] - rng['startIndex'])]
+            elif kind == 'deleteDimension':
+                del grid[rng['startIndex']:rng['endIndex']]
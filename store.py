@@ -0,0 +1,163 @@
+import difflib
+
+import numpy as np
+import pandas as pd
+
+from school_year import DEFAULT_YEAR, LEGACY_YEAR
+from sheets import get_initial_after_df
+
+# 묶음 안에서만 쓰는 시트 행 위치 컬럼 (평평한 표를 시트 순서대로 다시 만들 때 사용)
+_POS = '_pos'
+
+def _group(df):
+    """name 기준으로 행을 나눈 {이름: DataFrame} (시트 행 위치 _pos 포함)"""
+    if df is None or 'name' not in df.columns:
+        return {}
+    df = df.assign(**{_POS: np.arange(len(df))})
+    return {name: g.reset_index(drop=True) for name, g in df.groupby('name', sort=False, dropna=False)}
+
+def _rows(df, cols):
+    return list(df.reindex(columns=cols).astype(str).itertuples(index=False, name=None))
+
+class DataStore:
+    """강사 / 방과후 / 개인일정 시트를 강사 이름으로 묶어 들고 있는 메모리 저장소.
+
+    강사별 조회와 교체는 해당 강사 행만 건드리고, 시트에 쓸 평평한 표는
+    변경이 있었을 때 필요한 시점(저장·전체 합계)에만 다시 만든다."""
+
+    def __init__(self, ins_df, excl_df, after_df, indiv_df):
+        self.excl_df = excl_df
+        self._set_ins(ins_df)
+        self._after_cols = list(after_df.columns) if after_df is not None else []
+        self._indiv_cols = list(indiv_df.columns) if indiv_df is not None else []
+        self._after = _group(after_df)
+        self._indiv = _group(indiv_df)
+        self._flat = {'after': after_df, 'indiv': indiv_df}
+        # 새로 추가되는 행의 시트 위치 (맨 끝부터)
+        self._next_pos = {'after': len(after_df) if after_df is not None else 0,
+                          'indiv': len(indiv_df) if indiv_df is not None else 0}
+        # 마지막 take_changes() 이후 데이터가 바뀐 강사 이름 (예산 요약 부분 갱신용)
+        self._changed = set()
+
+    # [강사]
+    def _set_ins(self, ins_df):
+        self.ins_df = ins_df
+        # 같은 이름이 여러 행이면 기존 화면처럼 마지막 행 기준
+        names = ins_df['name'].tolist() if 'name' in ins_df.columns else []
+        self._ins_pos = {n: i for i, n in enumerate(names)}
+        self._ins_rows = {}
+        for i, n in enumerate(names):
+            self._ins_rows.setdefault(n, []).append(i)
+
+    @property
+    def names(self):
+        return list(self._ins_pos)
+
+    def instructor(self, name):
+        return self.ins_df.iloc[self._ins_pos[name]]
+
+    def instructor_rows(self, name):
+        """같은 이름의 강사 행 전부 (예산은 중복 행도 각각 계산)"""
+        return self.ins_df.iloc[self._ins_rows.get(name, [])]
+
+    def replace_instructors(self, ins_df):
+        old = self._row_values()
+        self._set_ins(ins_df.reset_index(drop=True))
+        new = self._row_values()
+        self._changed |= {n for n in set(old) | set(new) if old.get(n) != new.get(n)}
+
+    def _row_values(self):
+        """{이름: 그 이름 행들의 값} — 추가/삭제/수정된 강사를 찾는 비교용"""
+        rows = self.ins_df.astype(str).itertuples(index=False)
+        out = {}
+        for n, row in zip(self.ins_df['name'] if 'name' in self.ins_df.columns else [], rows):
+            out.setdefault(n, []).append(tuple(row))
+        return out
+
+    def update_instructor(self, name, cols, values):
+        """강사 정보 수정 (같은 이름의 행 모두)"""
+        self.ins_df.loc[self.ins_df['name'] == name, cols] = values
+        self._changed.add(name)
+
+    def take_changes(self):
+        """바뀐 강사 이름을 돌려주고 비운다"""
+        changed, self._changed = self._changed, set()
+        return changed
+
+    # [방과후 / 개인일정]
+    def _year_mask(self, df, year):
+        years = df['year'] if 'year' in df.columns else pd.Series(LEGACY_YEAR, index=df.index)
+        return years == year
+
+    def after_for(self, name, year=DEFAULT_YEAR):
+        """강사의 그 학년도 월별 방과후 시수 (없으면 기본 틀)"""
+        g = self._after.get(name)
+        if g is not None:
+            g = g[self._year_mask(g, year)]
+        return g.drop(columns=_POS).reset_index(drop=True) if g is not None and not g.empty else get_initial_after_df(name, year)
+
+    def after_year_df(self, year=DEFAULT_YEAR):
+        """그 학년도 방과후 시수만 (전체 예산 계산용)"""
+        df = self.after_df
+        return df[self._year_mask(df, year)] if not df.empty else df
+
+    def indiv_for(self, name):
+        g = self._indiv.get(name)
+        return g.drop(columns=_POS) if g is not None else pd.DataFrame(columns=self._indiv_cols or ['name', 'date', 'type', 'hours', 'note'])
+
+    def _place(self, key, old, new):
+        """new 행에 시트 위치를 붙인다. old 와 값이 같거나 자리에서 수정된 행은 원래 위치, 새 행은 시트 맨 끝"""
+        pos = np.full(len(new), -1, dtype=np.int64)
+        if old is not None and not old.empty:
+            cols = [c for c in new.columns if c != _POS]
+            old_pos = old[_POS].to_numpy()
+            sm = difflib.SequenceMatcher(None, _rows(old, cols), _rows(new, cols), autojunk=False)
+            for tag, i1, i2, j1, j2 in sm.get_opcodes():
+                if tag in ('equal', 'replace'):
+                    n = min(i2 - i1, j2 - j1)
+                    pos[j1:j1 + n] = old_pos[i1:i1 + n]
+        added = pos < 0
+        pos[added] = self._next_pos[key] + np.arange(added.sum())
+        self._next_pos[key] += int(added.sum())
+        return new.assign(**{_POS: pos}).reset_index(drop=True)
+
+    def replace_after(self, name, df, year=DEFAULT_YEAR):
+        """강사의 그 학년도 방과후 시수 교체 (다른 학년도 행은 그대로)"""
+        g = self._after.get(name)
+        mask = self._year_mask(g, year) if g is not None else None
+        rows = self._place('after', g[mask] if g is not None else None, df.assign(name=name, year=year))
+        other = g[~mask] if g is not None else None
+        self._after[name] = pd.concat([other, rows], ignore_index=True) if other is not None and not other.empty else rows
+        self._flat['after'] = None
+        self._changed.add(name)
+
+    def replace_indiv(self, name, df):
+        self._indiv[name] = self._place('indiv', self._indiv.get(name), df.assign(name=name))
+        self._flat['indiv'] = None
+        self._changed.add(name)
+
+    def add_indiv(self, name, rows):
+        self.replace_indiv(name, pd.concat([self.indiv_for(name), rows], ignore_index=True))
+
+    def _flatten(self, key, groups, cols):
+        if self._flat[key] is None:
+            frames = [g for g in groups.values() if not g.empty]
+            if frames:
+                # 시트 행 위치 순서로 되돌려야 저장할 때 바뀐 행만 반영된다
+                flat = pd.concat(frames, ignore_index=True).sort_values(_POS, kind='stable').drop(columns=_POS)
+                # 컬럼 순서도 시트 그대로 (묶음마다 순서가 다를 수 있다)
+                order = [c for c in cols if c in flat.columns] + [c for c in flat.columns if c not in cols]
+                self._flat[key] = flat[order].reset_index(drop=True)
+            else:
+                self._flat[key] = pd.DataFrame(columns=cols)
+        return self._flat[key]
+
+    @property
+    def after_df(self):
+        """AfterSchool 시트 형태의 평평한 표"""
+        return self._flatten('after', self._after, self._after_cols)
+
+    @property
+    def indiv_df(self):
+        """Exclusions_Indiv 시트 형태의 평평한 표"""
+        return self._flatten('indiv', self._indiv, self._indiv_cols)
@@ -0,0 +1,182 @@
+"""예산 계산을 기존 날짜별 반복(원래 app.py 의 계산)과 비교한다."""
+import random
+from datetime import date, timedelta
+
+import pandas as pd
+
+from budget import BudgetSummary, build_school_calendar, compute_budget, get_regular_hours
+from exclusions import ExclusionIndex
+from scenarios import Scenario, apply_scenario, evaluate_scenarios
+from school_year import get_year
+from store import DataStore
+
+YEAR = 2026
+
+def _instructors():
+    return pd.DataFrame([
+        {"name": "김", "rate": 30000, "rate_after": 50000, "mon": 2, "tue": 0, "wed": 3, "thu": 0, "fri": 1},
+        {"name": "이", "rate": 25000, "rate_after": 40000, "mon": 0, "tue": 4, "wed": 0, "thu": 4, "fri": 2},
+        # 요일 시수가 모두 0 (추가출근 시수 0 이면 0시간)
+        {"name": "박", "rate": 28000, "rate_after": 50000, "mon": 0, "tue": 0, "wed": 0, "thu": 0, "fri": 0},
+        # 같은 이름이 두 행
+        {"name": "김", "rate": 35000, "rate_after": 45000, "mon": 1, "tue": 1, "wed": 0, "thu": 2, "fri": 0},
+    ])
+
+def _exclusions():
+    return pd.DataFrame([
+        {"start_date": date(2026, 7, 20), "end_date": date(2026, 8, 20), "note": "여름방학"},
+        {"start_date": date(2026, 8, 10), "end_date": date(2026, 8, 25), "note": "연장"},
+        {"start_date": date(2026, 4, 10), "end_date": date(2026, 4, 10), "note": "시험"},
+    ])
+
+def _indiv():
+    rows = [
+        ("김", date(2026, 3, 4), "개인휴무", 0),
+        ("김", date(2026, 5, 11), "개인휴무", 0),
+        # 공통 제외일 · 공휴일 · 주말의 추가출근
+        ("김", date(2026, 7, 22), "추가출근", 5),
+        ("이", date(2026, 5, 5), "추가출근", 0),
+        ("이", date(2026, 3, 7), "추가출근", 0),
+        ("김", date(2026, 8, 15), "추가출근", 0),
+        # 시수 0 → 기본 시수
+        ("김", date(2026, 4, 10), "추가출근", 0),
+        ("박", date(2026, 9, 2), "추가출근", 0),
+        # 같은 날짜 추가출근이 여러 번이면 마지막 행
+        ("이", date(2026, 6, 9), "추가출근", 2),
+        ("이", date(2026, 6, 9), "추가출근", 7),
+        ("이", date(2026, 10, 13), "개인휴무", 0),
+        ("이", date(2026, 10, 13), "추가출근", 3),
+        # 학년도 밖 날짜는 무시
+        ("김", date(2026, 1, 5), "추가출근", 4),
+    ]
+    return pd.DataFrame([{"name": n, "date": d, "type": t, "hours": h, "note": ""} for n, d, t, h in rows])
+
+def _after():
+    rows = [{"name": "김", "month": f"{m}월", "w1": 1, "w2": 0, "w3": 2, "w4": 0, "w5": 1, "w6": 0} for m in (3, 4, 9)]
+    rows.append({"name": "박", "month": "5월", "w1": 0, "w2": 2, "w3": 2, "w4": 0, "w5": 0, "w6": 0})
+    return pd.DataFrame(rows)
+
+def _reference(ins_df, indiv_df, after_df, excl_df, sy):
+    """기존 날짜별 반복 계산 → (총액, 강사 행별 급여)"""
+    all_ex_common = set(sy.holidays)
+    for _, ex in excl_df.iterrows():
+        s_d, e_d = ex['start_date'], ex['end_date']
+        while s_d <= e_d:
+            all_ex_common.add(s_d)
+            s_d += timedelta(days=1)
+    pays = []
+    for _, ins in ins_df.iterrows():
+        pay = 0
+        ind_ex, ind_add_hours = set(), {}
+        for _, ind in indiv_df[indiv_df['name'] == ins['name']].iterrows():
+            if ind['type'] == '개인휴무':
+                ind_ex.add(ind['date'])
+            elif ind['type'] == '추가출근':
+                ind_add_hours[ind['date']] = int(ind.get('hours', 0))
+        hm_i = {0: int(ins['mon']), 1: int(ins['tue']), 2: int(ins['wed']), 3: int(ins['thu']), 4: int(ins['fri'])}
+        curr_d = sy.start
+        while curr_d <= sy.end:
+            if curr_d in ind_add_hours:
+                pay += get_regular_hours(curr_d, hm_i, ind_add_hours) * int(ins['rate'])
+            elif curr_d.weekday() < 5 and curr_d not in all_ex_common and curr_d not in ind_ex:
+                pay += hm_i.get(curr_d.weekday(), 0) * int(ins['rate'])
+            curr_d += timedelta(days=1)
+        t_aft_sum = after_df[after_df['name'] == ins['name']]
+        pay += int(t_aft_sum[['w1', 'w2', 'w3', 'w4', 'w5', 'w6']].sum().sum() * ins.get('rate_after', 50000))
+        pays.append(pay)
+    return sum(pays), pays
+
+def _calendar(excl_df, sy):
+    return build_school_calendar(ExclusionIndex(sy.holidays, excl_df), sy)
+
+def test_compute_budget_matches_daily_loop():
+    sy = get_year(YEAR)
+    ins, indiv, after, excl = _instructors(), _indiv(), _after(), _exclusions()
+    total, breakdown = compute_budget(ins, indiv, after, _calendar(excl, sy))
+    ref_total, ref_pays = _reference(ins, indiv, after, excl, sy)
+    assert total == ref_total
+    assert breakdown['name'].tolist() == ins['name'].tolist()
+    assert breakdown['pay'].tolist() == ref_pays
+
+def test_compute_budget_without_schedules():
+    sy = get_year(YEAR)
+    ins = _instructors()
+    empty_indiv = pd.DataFrame(columns=['name', 'date', 'type', 'hours', 'note'])
+    empty_after = pd.DataFrame(columns=['name', 'month', 'w1', 'w2', 'w3', 'w4', 'w5', 'w6'])
+    empty_excl = pd.DataFrame(columns=['start_date', 'end_date', 'note'])
+    total, breakdown = compute_budget(ins, empty_indiv, empty_after, _calendar(empty_excl, sy))
+    ref_total, ref_pays = _reference(ins, empty_indiv, empty_after, empty_excl, sy)
+    assert total == ref_total
+    assert breakdown['pay'].tolist() == ref_pays
+
+def _by_name(summary):
+    return summary.table().groupby(['name', 'month']).sum().sort_index()
+
+def test_incremental_summary_matches_rebuild():
+    """화면의 get_budget_summary 처럼 바뀐 강사 / 제외 날짜만 반영한 요약이 전체 재계산과 같아야 한다"""
+    sy = get_year(YEAR)
+    store = DataStore(_instructors(), _exclusions(), _after().assign(year=YEAR), _indiv())
+
+    def calendar():
+        return _calendar(store.excl_df, sy)
+
+    summary = BudgetSummary(store.ins_df, store.indiv_df, store.after_year_df(YEAR), calendar())
+    edits = [
+        lambda: store.add_indiv("이", pd.DataFrame([{"name": "이", "date": date(2026, 7, 25), "type": "추가출근", "hours": 0, "note": ""}])),
+        lambda: store.replace_indiv("김", store.indiv_for("김").iloc[1:]),
+        lambda: store.update_instructor("박", ['rate', 'wed'], [31000, 2]),
+        lambda: store.replace_after("박", store.after_for("박", YEAR).assign(w1=3), YEAR),
+        lambda: setattr(store, 'excl_df', pd.concat([store.excl_df, pd.DataFrame([
+            {"start_date": date(2026, 11, 2), "end_date": date(2026, 11, 6), "note": "공사"}])], ignore_index=True)),
+        lambda: store.replace_instructors(pd.concat([store.ins_df, pd.DataFrame([
+            {"name": "최", "rate": 27000, "rate_after": 50000, "mon": 3, "tue": 3, "wed": 0, "thu": 0, "fri": 0}])], ignore_index=True)),
+        lambda: store.add_indiv("최", pd.DataFrame([{"name": "최", "date": date(2026, 3, 9), "type": "개인휴무", "hours": 0, "note": ""}])),
+        lambda: setattr(store, 'excl_df', store.excl_df.iloc[1:]),
+        # 같은 이름 두 행 중 하나 삭제
+        lambda: store.replace_instructors(store.ins_df.drop(index=3)),
+        lambda: store.replace_instructors(store.ins_df[store.ins_df['name'] != "이"]),
+    ]
+    for edit in edits:
+        edit()
+        summary.update_exclusions(calendar())
+        for name in store.take_changes():
+            summary.update_instructor(name, store.instructor_rows(name), store.indiv_for(name), store.after_for(name, YEAR))
+        full = BudgetSummary(store.ins_df, store.indiv_df, store.after_year_df(YEAR), calendar())
+        assert summary.total() == full.total()
+        assert summary.total() == compute_budget(store.ins_df, store.indiv_df, store.after_year_df(YEAR), calendar())[0]
+        pd.testing.assert_frame_equal(_by_name(summary), _by_name(full))
+
+def _synthetic(n, seed):
+    """강사 n 명 (이름 중복 포함) · 개인일정 · 방과후 시수"""
+    rnd = random.Random(seed)
+    ins = pd.DataFrame([{
+        "name": f"T{i % (n - 3)}", "rate": rnd.choice([25000, 30000, 33333]), "rate_after": rnd.choice([40000, 50000]),
+        **{c: rnd.choice([0, 0, 1, 2, 3, 4]) for c in ['mon', 'tue', 'wed', 'thu', 'fri']},
+    } for i in range(n)])
+    indiv = pd.DataFrame([{
+        "name": f"T{rnd.randrange(n)}", "date": date(2026, 3, 1) + timedelta(rnd.randrange(306)),
+        "type": rnd.choice(["개인휴무", "추가출근"]), "hours": rnd.choice([0, 0, 2, 3]), "note": "",
+    } for _ in range(n * 6)])
+    after = pd.DataFrame([{"name": f"T{i}", "month": f"{m}월", **{f"w{k}": rnd.choice([0, 1, 2]) for k in range(1, 7)}}
+                          for i in range(0, n, 2) for m in range(3, 13)])
+    return ins, indiv, after
+
+def test_scenarios_match_apply_scenario_and_compute_budget():
+    sy = get_year(YEAR)
+    ins, indiv, after = _synthetic(50, 3)
+    excl = _exclusions()
+    scenarios = [
+        Scenario("단가", rate_pct=5, rate_after_pct=-10),
+        Scenario("금요일-1", weekdays=(4,), hours_delta=-1),
+        Scenario("추가방학", excl_start=date(2026, 8, 21), excl_end=date(2026, 8, 28)),
+        Scenario("혼합", 3, 7.5, (0, 2), 2, date(2026, 5, 1), date(2026, 5, 8)),
+    ]
+    original = ins.copy()
+    summary, per = evaluate_scenarios(ins, indiv, after, excl, sy, scenarios)
+    assert summary['scenario'].tolist() == ["기준"] + [sc.name for sc in scenarios]
+    for sc in [Scenario("기준")] + scenarios:
+        sc_ins, sc_excl = apply_scenario(ins, excl, sc)
+        total, breakdown = compute_budget(sc_ins, indiv, after, _calendar(sc_excl, sy))
+        assert summary.loc[summary['scenario'] == sc.name, 'pay'].item() == total
+        assert per[sc.name].tolist() == breakdown['pay'].tolist()
+    pd.testing.assert_frame_equal(ins, original)
@@ -0,0 +1,48 @@
+"""공통 제외 색인을 날짜별 사전(기존 tips 계산)과 비교한다."""
+import random
+from datetime import date, timedelta
+
+import pandas as pd
+
+from exclusions import ExclusionIndex
+from sheets import safe_str
+
+def _daily(holidays, excl_df):
+    """날짜별 사유 — 공휴일을 먼저 넣고 시트 행 순서대로 덮어쓴다"""
+    tips = {d: safe_str(label, "공휴일") for d, label in holidays.items()}
+    for s_d, e_d, note in zip(excl_df['start_date'], excl_df['end_date'], excl_df['note']):
+        if pd.isna(s_d) or pd.isna(e_d):
+            continue
+        while s_d <= e_d:
+            tips[s_d] = safe_str(note, "제외일")
+            s_d += timedelta(days=1)
+    return tips
+
+def test_matches_daily_labels():
+    rnd = random.Random(5)
+    days = [date(2026, 1, 1) + timedelta(k) for k in range(420)]
+    for _ in range(100):
+        holidays = {date(2026, 1, 1) + timedelta(rnd.randrange(365)): rnd.choice(["설날", None, "추석"]) for _ in range(10)}
+        rows = []
+        for _ in range(rnd.randrange(15)):
+            s = date(2026, 1, 1) + timedelta(rnd.randrange(365))
+            e = s + timedelta(rnd.randrange(-3, 60))
+            rows.append({"start_date": s if rnd.random() > .1 else None, "end_date": e,
+                         "note": rnd.choice(["", "여름", "시험", None])})
+        excl = pd.DataFrame(rows, columns=['start_date', 'end_date', 'note'])
+        tips = _daily(holidays, excl)
+        idx = ExclusionIndex(holidays, excl)
+        assert [idx.label(d) for d in days] == [tips.get(d) for d in days]
+        assert idx.mask(days).tolist() == [d in tips for d in days]
+        for m in range(1, 13):
+            assert idx.month_dates(2026, m) == sorted(d for d in tips if d.year == 2026 and d.month == m)
+
+def test_adjacent_ranges_with_same_note_merge():
+    excl = pd.DataFrame([
+        {"start_date": date(2026, 7, 1), "end_date": date(2026, 7, 10), "note": "방학"},
+        {"start_date": date(2026, 7, 11), "end_date": date(2026, 7, 20), "note": "방학"},
+        {"start_date": date(2026, 7, 5), "end_date": date(2026, 7, 6), "note": "캠프"},
+    ])
+    idx = ExclusionIndex({}, excl)
+    assert idx.labels == ["방학", "캠프", "방학"]
+    assert idx.ends.tolist()[-1] == date(2026, 7, 20).toordinal()
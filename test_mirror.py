@@ -0,0 +1,101 @@
+"""SqliteMirror 오프라인 저장 · 재시작 · 받아오기 · 올리기 (로컬 연결 기준)."""
+import pandas as pd
+import pytest
+
+from mirror import SqliteMirror
+from sheets import LocalSheetConnection, SheetWriter, read_sheet, to_rows
+
+def _instructors(n=5):
+    return pd.DataFrame([
+        {"name": f"T{i}", "rate": 25000 + i, "rate_after": 50000, "mon": 2, "tue": 0, "wed": 1, "thu": 0, "fri": 3,
+         "subject": "과학", "target_classes": "1학년"}
+        for i in range(n)
+    ])
+
+class _Flaky:
+    """down 인 동안 모든 호출이 실패하는 원격 연결"""
+
+    def __init__(self, conn):
+        self.conn, self.down = conn, False
+
+    def __getattr__(self, name):
+        if self.down:
+            raise ConnectionError("offline")
+        return getattr(self.conn, name)
+
+@pytest.fixture
+def remote():
+    return LocalSheetConnection({"Instructors": _instructors()})
+
+def _edit_rate(mirror, rate):
+    writer = SheetWriter(mirror, delay=0)
+    df, layout = read_sheet(mirror, "Instructors")
+    writer.track("Instructors", df, layout)
+    df = df.copy()
+    df.loc[0, 'rate'] = rate
+    writer.stage("Instructors", df)
+    assert writer.last_error is None
+    return df
+
+def test_push_sends_changed_row_with_numbers(tmp_path, remote):
+    mirror = SqliteMirror(str(tmp_path / "m.db"), remote)
+    _edit_rate(mirror, 26000)
+    assert list(mirror.pending()) == ["Instructors"]
+    remote.calls.clear()
+    mirror.sync()
+    assert mirror.pending() == {}
+    assert ('update', 'Instructors') not in remote.calls
+    # 로컬 사본은 문자열이지만 시트에는 숫자로 올라간다
+    assert remote.grids["Instructors"][1][:4] == ["T0", 26000, 50000, 2]
+    assert remote.grids["Instructors"][2][:2] == ["T1", 25001]
+
+def test_offline_edit_is_kept_until_sheet_is_back(tmp_path, remote):
+    flaky = _Flaky(remote)
+    mirror = SqliteMirror(str(tmp_path / "m.db"), flaky)
+    read_sheet(mirror, "Instructors")
+    flaky.down = True
+    df = _edit_rate(mirror, 30000)
+    mirror.sync()
+    assert mirror.last_error
+    assert list(mirror.pending()) == ["Instructors"]
+    assert read_sheet(mirror, "Instructors")[0].loc[0, 'rate'] == 30000
+    flaky.down = False
+    mirror.sync()
+    assert mirror.pending() == {}
+    assert to_rows(read_sheet(remote, "Instructors")[0]) == to_rows(df)
+
+def test_outbox_survives_restart(tmp_path, remote):
+    path = str(tmp_path / "m.db")
+    df = _edit_rate(SqliteMirror(path, remote), 31000)
+    restarted = SqliteMirror(path, remote)
+    assert list(restarted.pending()) == ["Instructors"]
+    remote.calls.clear()
+    restarted.sync()
+    assert restarted.pending() == {}
+    # 재시작 뒤에도 시트를 다시 읽어 기준을 잡고 바뀐 행만 올린다
+    assert ('update', 'Instructors') not in remote.calls
+    assert to_rows(read_sheet(remote, "Instructors")[0]) == to_rows(df)
+
+def test_pull_brings_sheet_changes(tmp_path, remote):
+    changed = []
+    mirror = SqliteMirror(str(tmp_path / "m.db"), remote, on_change=changed.append)
+    read_sheet(mirror, "Instructors")
+    remote.grids["Instructors"][3][1] = 77777
+    mirror.sync()
+    assert changed == ["Instructors"]
+    assert read_sheet(mirror, "Instructors")[0].loc[2, 'rate'] == 77777
+
+def test_never_pulled_sheet_is_not_written(tmp_path, remote):
+    flaky = _Flaky(remote)
+    flaky.down = True
+    mirror = SqliteMirror(str(tmp_path / "m.db"), flaky)
+    with pytest.raises(ConnectionError):
+        mirror.read(worksheet="Instructors")
+    with pytest.raises(RuntimeError):
+        mirror.update(worksheet="Instructors", data=_instructors(1).assign(name="NEW"))
+    assert mirror.pending() == {}
+    flaky.down = False
+    mirror.sync()
+    # 시트 내용은 그대로이고 로컬 사본은 시트에서 받아 온 것
+    assert [r[0] for r in remote.grids["Instructors"][1:]] == [f"T{i}" for i in range(5)]
+    assert read_sheet(mirror, "Instructors")[0]['name'].tolist() == [f"T{i}" for i in range(5)]
@@ -0,0 +1,46 @@
+"""학년도별 공휴일을 정부 발표 공휴일(대체공휴일 포함)과 비교한다."""
+import os
+import subprocess
+import sys
+from datetime import date
+
+import pytest
+
+from school_year import YEARS, get_year, holidays_for
+
+# 관공서의 공휴일에 관한 규정 기준 (임시공휴일 · 선거일 포함)
+OFFICIAL = {
+    2025: [
+        "01-01", "01-27", "01-28", "01-29", "01-30", "03-01", "03-03", "05-05", "05-06", "06-03", "06-06",
+        "08-15", "10-03", "10-05", "10-06", "10-07", "10-08", "10-09", "12-25",
+    ],
+    2026: [
+        "01-01", "02-16", "02-17", "02-18", "03-01", "03-02", "05-05", "05-24", "05-25", "06-03", "06-06",
+        "08-15", "08-17", "09-24", "09-25", "09-26", "10-03", "10-05", "10-09", "12-25",
+    ],
+    2027: [
+        "01-01", "02-06", "02-07", "02-08", "02-09", "03-01", "05-05", "05-13", "06-06", "08-15", "08-16",
+        "09-14", "09-15", "09-16", "10-03", "10-04", "10-09", "10-11", "12-25", "12-27",
+    ],
+}
+
+@pytest.mark.parametrize("year", sorted(OFFICIAL))
+def test_holidays_match_official_list(year):
+    assert [d.strftime("%m-%d") for d in holidays_for(year)] == OFFICIAL[year]
+
+def test_every_year_in_table_is_checked():
+    assert YEARS == sorted(OFFICIAL)
+
+def test_substitute_holidays_are_labelled():
+    hol = holidays_for(2026)
+    assert hol[date(2026, 10, 5)] == "대체공휴일"
+    assert hol[date(2026, 6, 3)] == "지방선거일"
+    assert date(2026, 9, 28) not in hol
+
+def test_unknown_year_fails():
+    with pytest.raises(ValueError):
+        get_year(2030)
+    env = dict(os.environ, SCHOOL_YEAR="2030")
+    res = subprocess.run([sys.executable, "-c", "import school_year"], env=env, capture_output=True, text=True,
+                         cwd=os.path.dirname(os.path.abspath(__file__)))
+    assert res.returncode != 0 and "SCHOOL_YEAR=2030" in res.stderr
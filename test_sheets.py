@@ -0,0 +1,120 @@
+"""SheetWriter 행 단위 반영 (로컬 연결 기준)."""
+import threading
+from datetime import date
+
+import pandas as pd
+
+from sheets import LocalSheetConnection, SheetWriter, read_sheet, to_rows
+
+WS = "Exclusions_Indiv"
+
+def _sheet(n):
+    return pd.DataFrame([
+        {"name": f"N{i}", "date": f"2026-05-{i % 28 + 1:02d}", "type": "추가출근", "hours": i % 4, "note": ""}
+        for i in range(n)
+    ])
+
+def _writer(n=30):
+    conn = LocalSheetConnection({WS: _sheet(n)})
+    writer = SheetWriter(conn, delay=0)
+    df, layout = read_sheet(conn, WS)
+    writer.track(WS, df, layout)
+    conn.calls.clear()
+    return conn, writer, df
+
+def _row(name):
+    return pd.DataFrame([{"name": name, "date": date(2026, 6, 1), "type": "개인휴무", "hours": 0, "note": "x"}])
+
+def test_structural_changes_are_one_request():
+    conn, writer, df = _writer()
+    df = df.copy()
+    df.loc[3, 'hours'] = 9
+    df = pd.concat([df.iloc[:5], _row("A"), df.iloc[7:20], _row("B"), df.iloc[20:]], ignore_index=True)
+    writer.stage(WS, df)
+    # 시트 확인 1번, 행 삽입/삭제 1번, 값 쓰기 1번
+    assert [c[0] for c in conn.calls] == ['col_values', 'spreadsheet_batch_update', 'batch_update']
+    assert set(conn.calls[1][1]) == {'deleteDimension', 'insertDimension'}
+    assert to_rows(read_sheet(conn, WS)[0]) == to_rows(df)
+
+def test_edit_only_writes_values():
+    conn, writer, df = _writer()
+    df = df.copy()
+    df.loc[4, 'date'] = date(2026, 9, 1)
+    writer.stage(WS, df)
+    assert conn.calls == [('col_values', WS), ('batch_update', WS)]
+    # 날짜는 conn.update 와 같이 ISO 문자열을 USER_ENTERED 로 보낸다
+    assert conn.grids[WS][5][1] == "2026-09-01"
+
+def test_rows_changed_in_sheet_since_read_rewrite_whole_sheet():
+    conn, writer, df = _writer()
+    # 읽은 뒤 누군가 시트에서 직접 한 행을 지웠다
+    del conn.grids[WS][3]
+    conn.calls.clear()
+    df = df.copy()
+    df.loc[3, 'note'] = "메모"
+    writer.stage(WS, df)
+    assert conn.calls == [('col_values', WS), ('update', WS)]
+    assert to_rows(read_sheet(conn, WS)[0]) == to_rows(df)
+
+def test_saves_within_delay_are_coalesced():
+    conn = LocalSheetConnection({WS: _sheet(30)})
+    writer = SheetWriter(conn, delay=0.2)
+    df, layout = read_sheet(conn, WS)
+    writer.track(WS, df, layout)
+    conn.calls.clear()
+    for k in range(5):
+        df = df.copy()
+        df.loc[k, 'hours'] = 7
+        writer.stage(WS, df)
+    assert conn.calls == []
+    done = threading.Event()
+    writer.on_flush = lambda worksheet: done.set()
+    assert done.wait(5)
+    assert conn.calls == [('col_values', WS), ('batch_update', WS)]
+    assert to_rows(read_sheet(conn, WS)[0]) == to_rows(df)
+
+def test_many_structural_changes_rewrite_whole_sheet():
+    conn, writer, df = _writer()
+    # 한 행 건너 하나씩 삭제 → 삭제 구간이 max_structural 보다 많다
+    df = df.iloc[::2].reset_index(drop=True)
+    writer.stage(WS, df)
+    assert conn.calls == [('update', WS)]
+    assert to_rows(read_sheet(conn, WS)[0]) == to_rows(df)
+
+def test_unchanged_save_sends_nothing():
+    conn, writer, df = _writer()
+    writer.stage(WS, df)
+    assert conn.calls == []
+
+def _with_bad_dates(n, at):
+    df = _sheet(n)
+    for k in at:
+        df.loc[k, 'date'] = "3월 5일"
+    return df
+
+def test_bad_date_rows_are_reported_and_kept_on_save():
+    conn = LocalSheetConnection({WS: _with_bad_dates(10, [3, 6])})
+    df, layout = read_sheet(conn, WS)
+    # 계산에서는 빠지고, 시트 행 번호(헤더=1행)와 원래 값으로 보고된다
+    assert len(df) == 8
+    assert list(layout.invalid.index) == [5, 8]
+    assert layout.invalid['date'].tolist() == ["3월 5일", "3월 5일"]
+    assert not layout.aligned
+    writer = SheetWriter(conn, delay=0)
+    writer.track(WS, df, layout)
+    df = df.copy()
+    df.loc[0, 'hours'] = 9
+    writer.stage(WS, df)
+    # 첫 저장은 전체를 다시 쓰고, 날짜 오류 행은 맨 아래로 모아 그대로 둔다
+    grid = conn.grids[WS]
+    assert len(grid) == 11
+    assert [r[0] for r in grid[-2:]] == ["N3", "N6"]
+    assert [r[1] for r in grid[-2:]] == ["3월 5일", "3월 5일"]
+    # 이후 저장은 행 단위로 반영되고 날짜 오류 행은 계속 남는다
+    conn.calls.clear()
+    writer.stage(WS, pd.concat([df.iloc[1:], _row("C")], ignore_index=True))
+    assert ('update', WS) not in conn.calls
+    df2, layout2 = read_sheet(conn, WS)
+    assert layout2.aligned
+    assert layout2.invalid['name'].tolist() == ["N3", "N6"]
+    assert df2['name'].tolist()[-1] == "C"
@@ -0,0 +1,77 @@
+"""DataStore 가 강사별로 바꾼 표를 시트 행 순서 그대로 되돌리는지 확인한다."""
+from datetime import date
+
+import pandas as pd
+
+from sheets import LocalSheetConnection, SheetWriter, read_sheet, to_rows
+from store import DataStore
+
+def _interleaved():
+    """이름이 번갈아 나오는 시트 (강사별로 묶으면 순서가 바뀐다)"""
+    indiv = pd.DataFrame([
+        {"name": f"T{i % 3}", "date": f"2026-05-{i + 1:02d}", "type": "개인휴무", "hours": 0, "note": ""}
+        for i in range(27)
+    ])
+    after = pd.DataFrame([
+        {"name": f"T{i % 3}", "month": f"{i // 3 + 3}월", "w1": 1, "w2": 0, "w3": 0, "w4": 0, "w5": 0, "w6": 0, "year": 2026}
+        for i in range(27)
+    ])
+    ins = pd.DataFrame([{"name": f"T{i}", "rate": 30000, "mon": 2} for i in range(3)])
+    return LocalSheetConnection({"Exclusions_Indiv": indiv, "AfterSchool": after, "Instructors": ins})
+
+def _open(conn):
+    writer = SheetWriter(conn, delay=0)
+    frames = {}
+    for ws in ["Instructors", "AfterSchool", "Exclusions_Indiv"]:
+        frames[ws], layout = read_sheet(conn, ws)
+        writer.track(ws, frames[ws], layout)
+    store = DataStore(frames["Instructors"], pd.DataFrame(columns=['start_date', 'end_date', 'note']),
+                      frames["AfterSchool"], frames["Exclusions_Indiv"])
+    conn.calls.clear()
+    return store, writer
+
+def test_adding_one_row_inserts_one_row():
+    conn = _interleaved()
+    store, writer = _open(conn)
+    new = pd.DataFrame([{"name": "T1", "date": date(2026, 6, 1), "type": "추가출근", "hours": 3, "note": "보강"}])
+    store.add_indiv("T1", new)
+    writer.stage("Exclusions_Indiv", store.indiv_df)
+    assert conn.calls == [('col_values', 'Exclusions_Indiv'), ('spreadsheet_batch_update', ['insertDimension']),
+                          ('batch_update', 'Exclusions_Indiv')]
+    assert to_rows(read_sheet(conn, "Exclusions_Indiv")[0]) == to_rows(store.indiv_df)
+    assert store.indiv_df.iloc[-1]['note'] == "보강"
+
+def test_editing_and_deleting_keep_other_rows_in_place():
+    conn = _interleaved()
+    store, writer = _open(conn)
+    rows = store.indiv_for("T2")
+    assert '_pos' not in rows.columns
+    rows.loc[2, 'hours'] = 4
+    store.replace_indiv("T2", rows.drop(index=5))
+    writer.stage("Exclusions_Indiv", store.indiv_df)
+    assert conn.calls == [('col_values', 'Exclusions_Indiv'), ('spreadsheet_batch_update', ['deleteDimension']),
+                          ('batch_update', 'Exclusions_Indiv')]
+    assert to_rows(read_sheet(conn, "Exclusions_Indiv")[0]) == to_rows(store.indiv_df)
+
+def test_after_school_edit_updates_one_row():
+    conn = _interleaved()
+    store, writer = _open(conn)
+    aft = store.after_for("T0", 2026)
+    aft.loc[1, 'w2'] = 5
+    store.replace_after("T0", aft, 2026)
+    writer.stage("AfterSchool", store.after_df)
+    assert conn.calls == [('col_values', 'AfterSchool'), ('batch_update', 'AfterSchool')]
+    assert '_pos' not in store.after_df.columns
+    assert to_rows(read_sheet(conn, "AfterSchool")[0]) == to_rows(store.after_df)
+
+def test_flat_table_keeps_sheet_column_order():
+    conn = _interleaved()
+    store, _ = _open(conn)
+    columns = list(store.indiv_df.columns)
+    # 편집 화면에서 돌아온 표는 컬럼 순서가 다를 수 있다
+    rows = store.indiv_for("T0")
+    store.replace_indiv("T0", rows[['date', 'type', 'hours', 'note']])
+    assert list(store.indiv_df.columns) == columns
+    aft = store.after_for("T0", 2026)
+    store.replace_after("T0", aft[['month', 'w1', 'w2', 'w3', 'w4', 'w5', 'w6']], 2026)
+    assert list(store.after_df.columns) == list(read_sheet(conn, "AfterSchool")[0].columns)